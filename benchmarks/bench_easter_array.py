@@ -0,0 +1,41 @@
+"""
+  Benchmark of dateutil.easter.easter_array against a loop of easter()
+
+  Both are run for years 1583..4099 of every method and checked to agree.
+  Without NumPy easter_array falls back to its pure Python loop.
+
+  usage: python benchmarks/bench_easter_array.py [repeat]
+"""
+import os, sys, timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from dateutil import easter
+
+YEARS = list(range(1583, 4100))
+
+def main(argv):
+    repeat = int(argv[1]) if len(argv) > 1 else 5
+    years = YEARS
+    if easter.numpy is not None:
+        years = easter.numpy.array(YEARS)
+    print("%d years, %s" % (len(YEARS), "numpy" if easter.numpy is not None
+                            else "no numpy"))
+    for method in (easter.EASTER_JULIAN, easter.EASTER_ORTHODOX,
+                   easter.EASTER_WESTERN):
+        expected = [easter.easter(y, method) for y in YEARS]
+        months, days = easter.easter_array(years, method)
+        if ([(dt.month, dt.day) for dt in expected] !=
+                [(int(m), int(d)) for m, d in zip(months, days)]):
+            raise AssertionError("easter_array differs, method %d" % method)
+        scalar = min(timeit.repeat(
+            lambda: [easter.easter(y, method) for y in YEARS],
+            number=1, repeat=repeat))
+        array = min(timeit.repeat(
+            lambda: easter.easter_array(years, method),
+            number=1, repeat=repeat))
+        print("method %d: easter loop %.2fms, easter_array %.3fms" % (
+            method, scalar * 1000, array * 1000))
+
+if __name__ == '__main__':
+    main(sys.argv)
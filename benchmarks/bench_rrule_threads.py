@@ -0,0 +1,49 @@
+"""
+  Benchmark of many threads iterating one shared, cached rruleset
+
+  Every thread walks the whole set while the cache is being filled by the
+  others, the results are checked against a single threaded walk.
+
+  usage: python benchmarks/bench_rrule_threads.py [threads] [repeat]
+"""
+import os, sys, threading, time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from dateutil.rrule import rrule, rruleset, HOURLY, DAILY
+
+def make_set():
+    rset = rruleset(cache=True)
+    rset.rrule(rrule(HOURLY, dtstart=datetime(2000, 1, 1), count=40000))
+    rset.rrule(rrule(DAILY, dtstart=datetime(2000, 1, 1, 0, 30), count=3000))
+    rset.exdate(datetime(2000, 1, 2))
+    return rset
+
+def run(threads):
+    """ Returns seconds it took threads to walk a fresh set """
+    expected = list(make_set())
+    rset = make_set()
+    results = []
+    def walk():
+        results.append(list(rset) == expected)
+    workers = [threading.Thread(target=walk) for i in range(threads)]
+    start = time.time()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.time() - start
+    if results != [True] * threads:
+        raise AssertionError("threads got different recurrences")
+    return elapsed
+
+def main(argv):
+    threads = int(argv[1]) if len(argv) > 1 else 16
+    repeat = int(argv[2]) if len(argv) > 2 else 3
+    for n in (1, threads):
+        best = min(run(n) for i in range(repeat))
+        print("%2d threads: %.3fs" % (n, best))
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,54 @@
+"""
+  Benchmark of rruleset iteration merging many rdates and exdates
+
+  The set has 10000 rdates and 1000 exdates (and a variant adds rrules and
+  an exrule), the results are checked against a plain sorted list.
+
+  usage: python benchmarks/bench_rruleset_merge.py [repeat]
+"""
+import os, random, sys, timeit
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from dateutil.rrule import rrule, rruleset, DAILY, WEEKLY
+
+RDATES = 10000
+EXDATES = 1000
+
+def make_dates(seed):
+    rnd = random.Random(seed)
+    start = datetime(2000, 1, 1)
+    rdates = [start + timedelta(hours=rnd.randrange(24 * 3650))
+              for i in range(RDATES)]
+    exdates = rnd.sample(rdates, EXDATES)
+    return rdates, exdates
+
+def make_set(rdates, exdates, rules=False):
+    rset = rruleset()
+    for dt in rdates:
+        rset.rdate(dt)
+    for dt in exdates:
+        rset.exdate(dt)
+    if rules:
+        rset.rrule(rrule(DAILY, dtstart=datetime(2000, 1, 1, 12), count=3650))
+        rset.rrule(rrule(WEEKLY, dtstart=datetime(2000, 1, 3, 9), count=520))
+        rset.exrule(rrule(WEEKLY, dtstart=datetime(2000, 1, 2, 12),
+                          count=520))
+    return rset
+
+def main(argv):
+    repeat = int(argv[1]) if len(argv) > 1 else 5
+    rdates, exdates = make_dates(0)
+    expected = sorted(set(rdates) - set(exdates))
+    if list(make_set(rdates, exdates)) != expected:
+        raise AssertionError("rruleset differs from the sorted dates")
+    for rules in (False, True):
+        rset = make_set(rdates, exdates, rules)
+        best = min(timeit.repeat(lambda: list(rset), number=1, repeat=repeat))
+        print("%d rdates, %d exdates%s: %.2fms" % (
+            RDATES, EXDATES, " + rrules, exrule" if rules else "",
+            best * 1000))
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -6,7 +6,13 @@ Western, Orthodox or Julian algorithms.
 
 import datetime
 
-__all__ = ["easter", "EASTER_JULIAN", "EASTER_ORTHODOX", "EASTER_WESTERN"]
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+__all__ = ["easter", "easter_array",
+           "EASTER_JULIAN", "EASTER_ORTHODOX", "EASTER_WESTERN"]
 
 EASTER_JULIAN = 1
 EASTER_ORTHODOX = 2
@@ -52,6 +58,55 @@ def easter(year, method=EASTER_WESTERN):
     if not (1 <= method <= 3):
         raise ValueError("invalid method")
 
+    m, d = _easter_month_day(year, method)
+    return datetime.date(int(year), int(m), int(d))
+
+
+def easter_array(years, method=EASTER_WESTERN, datetime64=False):
+    """
+    Computes easter for many years at once, using the same algorithm as
+    :func:`easter`.
+
+    :param years:
+        A sequence of years, preferably a NumPy integer array.
+
+    :param method:
+        One of ``EASTER_JULIAN``, ``EASTER_ORTHODOX`` or ``EASTER_WESTERN``.
+
+    :param datetime64:
+        If ``True``, a ``datetime64[D]`` array of dates is returned instead
+        of the months and days arrays.
+
+    :return:
+        A ``(months, days)`` tuple of integer arrays. If NumPy is not
+        installed, the computation is done in a pure-Python loop and lists
+        are returned instead (a list of :class:`datetime.date` for
+        ``datetime64=True``).
+    """
+    if not (1 <= method <= 3):
+        raise ValueError("invalid method")
+
+    if numpy is None:
+        years = list(years)
+        md = [_easter_month_day(y, method) for y in years]
+        if datetime64:
+            return [datetime.date(y, m, d) for y, (m, d) in zip(years, md)]
+        return [m for m, d in md], [d for m, d in md]
+
+    y = numpy.asarray(years, dtype=numpy.int64)
+    m, d = _easter_month_day(y, method)
+    if datetime64:
+        return ((y - 1970).astype('datetime64[Y]') +
+                (m - 1).astype('timedelta64[M]')).astype('datetime64[D]') + \
+            (d - 1).astype('timedelta64[D]')
+    return m, d
+
+
+def _easter_month_day(y, method):
+    """
+    Returns easter month and day. Works both on integers and on NumPy
+    integer arrays.
+    """
     # g - Golden year - 1
     # c - Century
     # h - (23 - Epact) mod 30
@@ -62,7 +117,6 @@ def easter(year, method=EASTER_WESTERN):
     # e - Extra days to add for method 2 (converting Julian
     #     date to Gregorian date)
 
-    y = year
     g = y % 19
     e = 0
     if method < 3:
@@ -71,9 +125,7 @@ def easter(year, method=EASTER_WESTERN):
         j = (y + y//4 + i) % 7
         if method == 2:
             # Extra dates to convert Julian to Gregorian date
-            e = 10
-            if y > 1600:
-                e = e + y//100 - 16 - (y//100 - 16)//4
+            e = 10 + (y > 1600)*(y//100 - 16 - (y//100 - 16)//4)
     else:
         # New method
         c = y//100
@@ -86,4 +138,4 @@ def easter(year, method=EASTER_WESTERN):
     p = i - j + e
     d = 1 + (p + 27 + (p + 6)//40) % 31
     m = 3 + (p + 26)//30
-    return datetime.date(int(y), int(m), int(d))
+    return m, d
@@ -37,18 +37,49 @@ import re
 from io import StringIO
 from calendar import monthrange, isleap
 
-from six import text_type, binary_type, integer_types
+from six import text_type, binary_type, integer_types, unichr
 
 from . import relativedelta
 from . import tz
 
-__all__ = ["parse", "parserinfo"]
+__all__ = ["parse", "parse_many", "parserinfo", "layout", "layoutcache"]
+
+
+class _charshapes(dict):
+    """
+    ``unicode.translate`` table giving the shape of a string: letters are
+    replaced with ``a``, digits with ``0`` and whitespace with a space.
+    """
+    def __missing__(self, ordinal):
+        c = unichr(ordinal)
+        if c.isalpha():
+            shape = 'a'
+        elif c.isdigit():
+            shape = '0'
+        elif c.isspace():
+            shape = ' '
+        else:
+            shape = c
+        self[ordinal] = shape
+        return shape
+
+
+_charshapes = _charshapes()
+
+# Dotted part of a token, following its first dot: letters and digits
+# separated by dots
+_dotted = r"\.*(?:(?:a+|0+)\.+)*(?:a+|0+)?"
 
 
 class _timelex(object):
     # Fractional seconds are sometimes split by a comma
     _split_decimal = re.compile("([\.,])")
 
+    # Tokens of a string shape, as read by get_token() before the dotted
+    # ones are split
+    _shape_token = re.compile(r"(?s)0{2,},0*(?:\.%(d)s)?|0+\.%(d)s|0+|"
+                              r"a+\.%(d)s|a+|." % {'d': _dotted})
+
     def __init__(self, instream):
         if isinstance(instream, binary_type):
             instream = instream.decode()
@@ -189,7 +220,50 @@ class _timelex(object):
 
     @classmethod
     def split(cls, s):
-        return list(cls(s))
+        if isinstance(s, binary_type):
+            s = s.decode()
+
+        if not isinstance(s, text_type):
+            return list(cls(s))
+
+        # Same tokens as get_token(), found by matching the shape of the
+        # whole string instead of reading it char by char
+        s = s.replace('\x00', '')
+        shape = s.translate(_charshapes)
+        len_shape = len(shape)
+        tokens = []
+        for m in cls._shape_token.finditer(shape):
+            token_shape = m.group()
+            if token_shape == ' ':
+                tokens.append(' ')
+                continue
+
+            start, end = m.span()
+            token = s[start:end]
+            if (end - start == 1 or token_shape[0] not in 'a0' or
+                    ('.' not in token_shape and ',' not in token_shape)):
+                tokens.append(token)
+                continue
+
+            # get_token() sees letters once it reads a char after one
+            if token_shape[0] == 'a':
+                seenletters = True
+            else:
+                i = token_shape.find('a')
+                seenletters = (i != -1 and
+                               (i < end - start - 1 or end < len_shape))
+
+            if (seenletters or token.count('.') > 1 or
+                    token[-1] in '.,'):
+                l = cls._split_decimal.split(token)
+                tokens.append(l[0])
+                tokens.extend(tok for tok in l[1:] if tok)
+            elif token_shape.rstrip('.,')[-1] == '0' and '.' not in token:
+                tokens.append(token.replace(',', '.'))
+            else:
+                tokens.append(token)
+
+        return tokens
 
     @classmethod
     def isword(cls, nextchar):
@@ -207,6 +281,78 @@ class _timelex(object):
         return nextchar.isspace()
 
 
+class _tokencache(object):
+    """
+    Memoizes :meth:`_timelex.split` results by the "shape" of ASCII strings.
+
+    The lexer only looks at character classes (letters, digits, whitespace)
+    and at the literal separators, so strings like ``"2003-09-25"`` and
+    ``"2017-01-05"`` are split at the same positions. The shape of a string
+    replaces every letter with ``a`` and every digit with ``0``, its tokens
+    are cached and filled in with the characters of each new string.
+    """
+    def __init__(self, size=1024):
+        self._size = size
+        self._tokens = {}
+
+    def split(self, timestr):
+        return self.split_shape(timestr)[1]
+
+    def split_shape(self, timestr):
+        """
+        Returns the shape of ``timestr`` (``None`` if it has none) and its
+        tokens.
+        """
+        if isinstance(timestr, binary_type):
+            timestr = timestr.decode()
+
+        if not isinstance(timestr, text_type):
+            return None, _timelex.split(timestr)
+
+        try:
+            timestr.encode('ascii')
+        except UnicodeError:
+            return None, _timelex.split(timestr)
+
+        timestr = timestr.replace('\x00', '')
+        shape = timestr.translate(_charshapes)
+        try:
+            spans = self._tokens[shape]
+        except KeyError:
+            spans = self._spans(_timelex.split(shape))
+            if len(self._tokens) >= self._size:
+                self._tokens.clear()
+            self._tokens[shape] = spans
+
+        # Take letters and digits from timestr, everything else from the
+        # shape's tokens (the lexer may replace whitespace and commas).
+        l = []
+        for start, end, token in spans:
+            if token is None:
+                l.append(timestr[start:end])
+            elif 'a' in token or '0' in token:
+                l.append(''.join(t if t not in 'a0' else c
+                                 for t, c in zip(token, timestr[start:end])))
+            else:
+                l.append(token)
+
+        return shape, l
+
+    @staticmethod
+    def _spans(tokens):
+        """
+        Returns ``(start, end, token)`` of the tokens of a shape, ``token``
+        being ``None`` for tokens made of letters or digits only.
+        """
+        spans = []
+        pos = 0
+        for token in tokens:
+            end = pos + len(token)
+            spans.append((pos, end, token if token.strip('a0') else None))
+            pos = end
+        return spans
+
+
 class _resultbase(object):
 
     def __init__(self):
@@ -376,6 +522,8 @@ class _ymd(list):
         super(self.__class__, self).__init__(*args, **kwargs)
         self.century_specified = False
         self.tzstr = tzstr
+        # Tokens of tzstr, if already split
+        self.tokens = None
 
     @staticmethod
     def token_could_be_year(token, year):
@@ -465,7 +613,8 @@ class _ymd(list):
 
             else:
                 if self[0] > 31 or \
-                    self.find_probable_year_index(_timelex.split(self.tzstr)) == 0 or \
+                    self.find_probable_year_index(self.tokens or
+                                                  _timelex.split(self.tzstr)) == 0 or \
                    (yearfirst and self[1] <= 12 and self[2] <= 31):
                     # 99-01-01
                     if dayfirst and self[2] <= 12:
@@ -483,6 +632,9 @@ class _ymd(list):
 
 
 class parser(object):
+    # _tokencache used by _parse instead of splitting every string anew
+    _token_cache = None
+
     def __init__(self, info=None):
         self.info = info or parserinfo()
 
@@ -546,14 +698,22 @@ class parser(object):
             your system.
         """
 
+        res, skipped_tokens = self._parse(timestr, **kwargs)
+        ret = self._build(res, default, ignoretz, tzinfos)
+
+        if kwargs.get('fuzzy_with_tokens', False):
+            return ret, skipped_tokens
+        else:
+            return ret
+
+    def _build(self, res, default=None, ignoretz=False, tzinfos=None):
+        """
+        Builds the :class:`datetime.datetime` object of a ``_parse()``
+        result, see ``parse()`` for the parameters.
+        """
         if default is None:
-            effective_dt = datetime.datetime.now()
             default = datetime.datetime.now().replace(hour=0, minute=0,
                                                       second=0, microsecond=0)
-        else:
-            effective_dt = default
-
-        res, skipped_tokens = self._parse(timestr, **kwargs)
 
         if res is None:
             raise ValueError("Unknown string format")
@@ -609,10 +769,17 @@ class parser(object):
             elif res.tzoffset:
                 ret = ret.replace(tzinfo=tz.tzoffset(res.tzname, res.tzoffset))
 
-        if kwargs.get('fuzzy_with_tokens', False):
-            return ret, skipped_tokens
-        else:
-            return ret
+        return ret
+
+    def _parse_layout(self, timestr, layouts, default=None, ignoretz=False,
+                      tzinfos=None, dayfirst=None, yearfirst=None,
+                      fuzzy=False, fuzzy_with_tokens=False):
+        """
+        ``parse()`` through the layouts of a :class:`layoutcache`. Fuzzy
+        parsing is not supported.
+        """
+        res = layouts._parse(self, timestr, dayfirst, yearfirst)
+        return self._build(res, default, ignoretz, tzinfos)
 
     class _result(_resultbase):
         __slots__ = ["year", "month", "day", "weekday",
@@ -672,7 +839,11 @@ class parser(object):
             yearfirst = info.yearfirst
 
         res = self._result()
-        l = _timelex.split(timestr)         # Splits the timestr into tokens
+        # Splits the timestr into tokens
+        if self._token_cache is not None:
+            l = self._token_cache.split(timestr)
+        else:
+            l = _timelex.split(timestr)
 
         # keep up with the last token skipped so we can recombine
         # consecutively skipped tokens (-2 for when i begins at 0).
@@ -682,6 +853,7 @@ class parser(object):
         try:
             # year/month/day list
             ymd = _ymd(timestr)
+            ymd.tokens = l
 
             # Index of the month string in ymd
             mstridx = -1
@@ -1168,6 +1340,343 @@ def parse(timestr, parserinfo=None, **kwargs):
         return DEFAULTPARSER.parse(timestr, **kwargs)
 
 
+class layout(object):
+    """
+    Layout of the date/time strings of one shape, inferred by
+    :class:`layoutcache` from strings parsed by the full parser.
+
+    :ivar tokens:
+        Tuple of the tokens of the strings, ``None`` for tokens holding
+        digits.
+
+    :ivar roles:
+        Tuple of ``(index, role)`` pairs of the digit tokens, ``role`` being
+        ``'ymd'`` (year, month or day, resolved like the full parser does),
+        ``'hour'``, ``'minute'`` or ``'second'``.
+
+    :ivar constants:
+        Dictionary of the other parsed values (e.g. the time zone of a
+        trailing ``Z``), the same for every string of the layout.
+    """
+    _roles = ('ymd', 'hour', 'minute', 'second')
+
+    def __init__(self, tokens, roles, constants):
+        self.tokens = tuple(tokens)
+        self.roles = tuple(roles)
+        self.constants = dict(constants)
+        self._literals = [(i, token) for i, token in enumerate(self.tokens)
+                          if token is not None]
+
+    def __repr__(self):
+        tokens = list(self.tokens)
+        for i, role in self.roles:
+            tokens[i] = '{%s}' % role
+        return "%s(%s)" % (self.__class__.__name__, repr(''.join(tokens)))
+
+    @classmethod
+    def infer(cls, info, samples, dayfirst=False, yearfirst=False):
+        """
+        Returns the layout of strings parsed by the full parser or ``None``
+        if they do not have a common one.
+
+        :param info:
+            The :class:`parserinfo` used by the parser.
+
+        :param samples:
+            List of ``(timestr, tokens, result)`` tuples of strings of the
+            same shape, ``result`` being the ``parser._parse()`` result.
+        """
+        timestr, l, res = samples[0]
+
+        tokens = []
+        for token in l:
+            if token.isdigit():
+                tokens.append(None)
+            elif ([c for c in token if c.isdigit()] or
+                  info.month(token) is not None):
+                return None
+            else:
+                tokens.append(token)
+
+        # Each digit token has to fit exactly one role in all the samples,
+        # e.g. "18:05 2018-05-18" alone does not tell the hour from the day
+        ymd_left = sum(getattr(res, attr) is not None
+                       for attr in ('year', 'month', 'day'))
+        time_left = [attr for attr in cls._roles[1:]
+                     if getattr(res, attr) is not None]
+        roles = []
+        for i, token in enumerate(tokens):
+            if token is not None:
+                continue
+
+            fits = [role for role in cls._roles
+                    if (role == 'ymd' or role in time_left) and
+                    all(cls._fits(role, int(sl[i]), sres)
+                        for _, sl, sres in samples)]
+            if len(fits) != 1:
+                return None
+
+            role = fits[0]
+            if role == 'ymd' and not ymd_left:
+                return None
+
+            roles.append((i, role))
+            if role == 'ymd':
+                ymd_left -= 1
+            else:
+                time_left.remove(role)
+
+        if ymd_left or time_left:
+            return None
+
+        covered = set(role for i, role in roles)
+        if 'ymd' in covered:
+            covered.update(('year', 'month', 'day'))
+        constants = dict((attr, getattr(res, attr))
+                         for attr in res.__slots__ if attr not in covered)
+        if constants.get('ampm') is not None:
+            return None
+
+        lay = cls(tokens, roles, constants)
+
+        # The layout has to give exactly what the full parser gave, for the
+        # strings it does not leave to the full parser
+        attrs = res.__slots__ + ['century_specified']
+        for timestr, l, res in samples:
+            lres = lay._apply(info, timestr, l, dayfirst, yearfirst)
+            if lres is not None and \
+                    [getattr(lres, attr, None) for attr in attrs] != \
+                    [getattr(res, attr, None) for attr in attrs]:
+                return None
+
+        return lay
+
+    @staticmethod
+    def _fits(role, value, res):
+        if role == 'ymd':
+            return (value in (res.month, res.day) or
+                    res.year is not None and res.year % 100 == value % 100)
+        return getattr(res, role) == value
+
+    def _apply(self, info, timestr, l, dayfirst, yearfirst):
+        """
+        Returns the ``parser._parse()`` result of the tokens ``l`` of
+        ``timestr`` or ``None`` if they do not fit the layout.
+        """
+        if len(l) != len(self.tokens):
+            return None
+
+        for i, token in self._literals:
+            if l[i] != token:
+                return None
+
+        res = parser._result()
+        for attr, value in self.constants.items():
+            setattr(res, attr, value)
+
+        ymd = _ymd(timestr)
+        ymd.tokens = l
+        for i, role in self.roles:
+            token = l[i]
+            value = int(token)
+            if role == 'ymd':
+                # The full parser appends some numbers to ymd as strings and
+                # some as values, both set century_specified alike only if
+                if (len(token) > 2) != (value > 100):
+                    return None
+                if value > 100:
+                    ymd.century_specified = True
+                list.append(ymd, value)
+            else:
+                setattr(res, role, value)
+
+        if ymd:
+            year, month, day = ymd.resolve_ymd(-1, yearfirst, dayfirst)
+            if year is not None:
+                res.year = year
+                res.century_specified = ymd.century_specified
+            res.month = month
+            res.day = day
+
+        if not info.validate(res):
+            return None
+
+        return res
+
+
+class layoutcache(object):
+    """
+    Layouts of the date/time strings parsed by :func:`parse_many`.
+
+    Once ``samples`` distinct strings of the same shape (e.g. ``"2003-09-25"``
+    and ``"2017-01-05"``) have been parsed by the full parser, their common
+    :class:`layout` is inferred. Further strings of that shape are parsed by
+    the layout, falling back to the full parser if they do not fit it.
+
+    The cache can be pickled, with the samples of the shapes still waiting
+    for them, and used again by :func:`parse_many` calls with the same
+    ``parserinfo``.
+
+    :ivar layouts:
+        Dictionary of string shape -> :class:`layout`, ``None`` for shapes
+        without a common layout.
+
+    :ivar parsed:
+        Number of strings parsed through the cache.
+
+    :ivar fast:
+        Number of strings parsed by a layout.
+    """
+    # Max number of shapes waiting for samples
+    _max_pending = 1024
+
+    def __init__(self, samples=10):
+        self.samples = samples
+        self.layouts = {}
+        self.parsed = 0
+        self.fast = 0
+        self._samples = {}
+
+    def __repr__(self):
+        return "%s(%d layouts, %d of %d strings parsed by layouts)" % (
+            self.__class__.__name__,
+            len([lay for lay in self.layouts.values() if lay is not None]),
+            self.fast, self.parsed)
+
+    def __getstate__(self):
+        # Results are instances of the nested parser._result class with
+        # __slots__, which pickle can not handle, so they are kept as dicts
+        state = self.__dict__.copy()
+        state['_samples'] = dict(
+            (shape, [(timestr, l, self._result_dict(res))
+                     for timestr, l, res in samples])
+            for shape, samples in self._samples.items())
+        return state
+
+    def __setstate__(self, state):
+        state['_samples'] = dict(
+            (shape, [(timestr, l, self._dict_result(res))
+                     for timestr, l, res in samples])
+            for shape, samples in state['_samples'].items())
+        self.__dict__.update(state)
+
+    @staticmethod
+    def _result_dict(res):
+        d = dict((attr, getattr(res, attr)) for attr in res.__slots__)
+        d.update(res.__dict__)
+        return d
+
+    @staticmethod
+    def _dict_result(d):
+        res = parser._result()
+        for attr, value in d.items():
+            setattr(res, attr, value)
+        return res
+
+    def _parse(self, p, timestr, dayfirst=None, yearfirst=None):
+        """ ``parser._parse()`` result of ``timestr`` """
+        info = p.info
+
+        if dayfirst is None:
+            dayfirst = info.dayfirst
+
+        if yearfirst is None:
+            yearfirst = info.yearfirst
+
+        self.parsed += 1
+        shape, l = p._token_cache.split_shape(timestr)
+
+        lay = self.layouts.get(shape)
+        if lay is not None:
+            res = lay._apply(info, timestr, l, dayfirst, yearfirst)
+            if res is not None:
+                self.fast += 1
+                return res
+
+        res = p._parse(timestr, dayfirst, yearfirst)[0]
+
+        if (res is not None and shape is not None and
+                shape not in self.layouts):
+            samples = self._samples.get(shape)
+            if samples is None:
+                if len(self._samples) >= self._max_pending:
+                    return res
+                samples = self._samples[shape] = []
+
+            # Repeated strings tell nothing more about the layout
+            if timestr in [sample[0] for sample in samples]:
+                return res
+
+            samples.append((timestr, l, res))
+            if len(samples) >= self.samples:
+                del self._samples[shape]
+                self.layouts[shape] = layout.infer(info, samples,
+                                                   dayfirst, yearfirst)
+
+        return res
+
+
+def parse_many(timestrs, parserinfo=None, layouts=None, **kwargs):
+    """
+    Parse many strings in one of the supported formats, using the
+    ``parserinfo`` parameters.
+
+    A single :class:`parser` is used for all strings and the tokens of
+    strings of the same shape (e.g. ``"2003-09-25"`` and ``"2017-01-05"``)
+    are computed once. Results are generated lazily, so ``timestrs`` may be
+    an arbitrarily long iterable.
+
+    :param timestrs:
+        An iterable of strings containing date/time stamps.
+
+    :param parserinfo:
+        A :class:`parserinfo` object containing parameters for the parser.
+        If ``None``, the default arguments to the :class:`parserinfo`
+        constructor are used.
+
+    :param layouts:
+        A :class:`layoutcache` whose layouts are used, and inferred, to
+        parse strings of a known shape without the full parser. Ignored for
+        fuzzy parsing.
+
+    The ``**kwargs`` are the same as for :func:`parse`. If ``default`` is
+    not given, midnight of the current day, taken once when the first string
+    is parsed, is used for all strings.
+
+    :return:
+        Returns a generator of ``(result, error)`` tuples, one for each
+        string. ``result`` is the value :func:`parse` returns for the string
+        and ``error`` is ``None``, or ``result`` is ``None`` and ``error`` is
+        the exception raised while parsing the string.
+
+    .. doctest::
+
+        >>> from dateutil.parser import parse_many
+        >>> for res, err in parse_many(["2003-09-25", "2003-13-25"]):
+        ...     print("%s %s" % (res, err))
+        2003-09-25 00:00:00 None
+        None month must be in 1..12
+    """
+    p = parser(parserinfo)
+    p._token_cache = _tokencache()
+
+    if kwargs.get('default') is None:
+        kwargs['default'] = datetime.datetime.now().replace(
+            hour=0, minute=0, second=0, microsecond=0)
+
+    if kwargs.get('fuzzy') or kwargs.get('fuzzy_with_tokens'):
+        layouts = None
+
+    for timestr in timestrs:
+        try:
+            if layouts is None:
+                yield p.parse(timestr, **kwargs), None
+            else:
+                yield p._parse_layout(timestr, layouts, **kwargs), None
+        except (ValueError, OverflowError, TypeError) as e:
+            yield None, e
+
+
 class _tzparser(object):
 
     class _result(_resultbase):
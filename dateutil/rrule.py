@@ -18,6 +18,8 @@ except ImportError:
 from six import advance_iterator, integer_types
 from six.moves import _thread, range
 import heapq
+import bisect
+from collections import OrderedDict
 
 from ._common import weekday as weekdaybase
 
@@ -105,36 +107,45 @@ class rrulebase(object):
         else:
             return self._iter_cached()
 
+    # Number of recurrences computed at a time when filling the cache. Each
+    # fill computes as many as already cached, within these bounds, so that
+    # concurrent readers of a long recurrence take the lock only a few times.
+    _cache_chunk_min = 10
+    _cache_chunk_max = 1024
+
+    # Whether the recurrences are dates rather than datetimes
+    _dateonly = False
+
     def _invalidate_cache(self):
         if self._cache is not None:
             self._cache = []
             self._cache_complete = False
             self._cache_gen = self._iter()
 
-            if self._cache_lock.locked():
-                self._cache_lock.release()
-
         self._len = None
 
     def _iter_cached(self):
         i = 0
         gen = self._cache_gen
         cache = self._cache
-        acquire = self._cache_lock.acquire
-        release = self._cache_lock.release
+        lock = self._cache_lock
         while gen:
+            # Items already in the cache are read without taking the lock
             if i == len(cache):
-                acquire()
-                if self._cache_complete:
-                    break
-                try:
-                    for j in range(10):
-                        cache.append(advance_iterator(gen))
-                except StopIteration:
-                    self._cache_gen = gen = None
-                    self._cache_complete = True
-                    break
-                release()
+                with lock:
+                    if self._cache_complete:
+                        break
+                    # Another reader may have filled the cache meanwhile
+                    if i == len(cache):
+                        chunk = min(max(len(cache), self._cache_chunk_min),
+                                    self._cache_chunk_max)
+                        try:
+                            for j in range(chunk):
+                                cache.append(advance_iterator(gen))
+                        except StopIteration:
+                            self._cache_gen = gen = None
+                            self._cache_complete = True
+                            break
             yield cache[i]
             i += 1
         while i < self._len:
@@ -163,6 +174,12 @@ class rrulebase(object):
         else:
             return list(iter(self))[item]
 
+    def nth(self, n):
+        """ Returns the recurrence of index n (negative indexes count from
+            the end), the same as self[n]. Raises IndexError if there is no
+            such recurrence. """
+        return self[n]
+
     def __contains__(self, item):
         if self._cache_complete:
             return item in self._cache
@@ -174,6 +191,13 @@ class rrulebase(object):
                     return False
         return False
 
+    def ordinals(self):
+        """ Generator of the recurrences as day ordinals, as returned by
+            date.toordinal(). Date only rules yield them without building the
+            date objects. """
+        for dt in self:
+            yield dt.toordinal()
+
     # __len__() introduces a large performance penality.
     def count(self):
         """ Returns the number of recurrences in this set. It will have go
@@ -188,17 +212,19 @@ class rrulebase(object):
             inc keyword defines what happens if dt is an occurrence. With
             inc=True, if dt itself is an occurrence, it will be returned. """
         if self._cache_complete:
-            gen = self._cache
-        else:
-            gen = self
+            if inc:
+                i = bisect.bisect_right(self._cache, dt)
+            else:
+                i = bisect.bisect_left(self._cache, dt)
+            return self._cache[i-1] if i else None
         last = None
         if inc:
-            for i in gen:
+            for i in self:
                 if i > dt:
                     break
                 last = i
         else:
-            for i in gen:
+            for i in self:
                 if i >= dt:
                     break
                 last = i
@@ -209,15 +235,17 @@ class rrulebase(object):
             inc keyword defines what happens if dt is an occurrence. With
             inc=True, if dt itself is an occurrence, it will be returned.  """
         if self._cache_complete:
-            gen = self._cache
-        else:
-            gen = self
+            if inc:
+                i = bisect.bisect_left(self._cache, dt)
+            else:
+                i = bisect.bisect_right(self._cache, dt)
+            return self._cache[i] if i < len(self._cache) else None
         if inc:
-            for i in gen:
+            for i in self:
                 if i >= dt:
                     return i
         else:
-            for i in gen:
+            for i in self:
                 if i > dt:
                     return i
         return None
@@ -242,7 +270,12 @@ class rrulebase(object):
         """
 
         if self._cache_complete:
-            gen = self._cache
+            # Skip the recurrences up to dt without comparing them one by one
+            if inc:
+                i = bisect.bisect_left(self._cache, dt)
+            else:
+                i = bisect.bisect_right(self._cache, dt)
+            gen = itertools.islice(self._cache, i, None)
         else:
             gen = self
 
@@ -269,13 +302,11 @@ class rrulebase(object):
         themselves occurrences. With inc=True, they will be included in the
         list, if they are found in the recurrence set. """
         if self._cache_complete:
-            gen = self._cache
-        else:
-            gen = self
+            return self._slice(self._cache, after, before, inc)
         started = False
         l = []
         if inc:
-            for i in gen:
+            for i in self:
                 if i > before:
                     break
                 elif not started:
@@ -285,7 +316,7 @@ class rrulebase(object):
                 else:
                     l.append(i)
         else:
-            for i in gen:
+            for i in self:
                 if i >= before:
                     break
                 elif not started:
@@ -296,6 +327,38 @@ class rrulebase(object):
                     l.append(i)
         return l
 
+    def between_many(self, windows, inc=False):
+        """ Returns a list with the occurrences of the rrule between after
+        and before for each (after, before) pair of windows, as between()
+        would. The recurrence is only traversed once, up to the latest
+        before, so asking for e.g. every month of a year at once is much
+        cheaper than calling between() for each of them. """
+        windows = list(windows)
+        if not windows:
+            return []
+        if self._cache_complete:
+            occurrences = self._cache
+        else:
+            last = max(before for after, before in windows)
+            occurrences = []
+            for i in self:
+                if i > last:
+                    break
+                occurrences.append(i)
+        return [self._slice(occurrences, after, before, inc)
+                for after, before in windows]
+
+    @staticmethod
+    def _slice(occurrences, after, before, inc):
+        # occurrences is a sorted list
+        if inc:
+            lo = bisect.bisect_left(occurrences, after)
+            hi = bisect.bisect_right(occurrences, before)
+        else:
+            lo = bisect.bisect_right(occurrences, after)
+            hi = bisect.bisect_left(occurrences, before)
+        return occurrences[lo:hi]
+
 
 class rrule(rrulebase):
     """
@@ -413,13 +476,20 @@ class rrule(rrulebase):
         positive or negative. Each integer will define an offset from the
         Easter Sunday. Passing the offset 0 to byeaster will yield the Easter
         Sunday itself. This is an extension to the RFC specification.
+    :param dateonly:
+        If True, the recurrences are ``datetime.date`` instances instead of
+        datetimes, and :py:meth:`ordinals` yields them as plain integers
+        without building any date object. Only rules with a frequency of at
+        most DAILY and no byhour, byminute or bysecond may be date only; the
+        time and time zone of dtstart and until are ignored. This is an
+        extension to the RFC specification.
      """
     def __init__(self, freq, dtstart=None,
                  interval=1, wkst=None, count=None, until=None, bysetpos=None,
                  bymonth=None, bymonthday=None, byyearday=None, byeaster=None,
                  byweekno=None, byweekday=None,
                  byhour=None, byminute=None, bysecond=None,
-                 cache=False):
+                 cache=False, dateonly=False):
         super(rrule, self).__init__(cache)
         global easter
         if not dtstart:
@@ -428,6 +498,14 @@ class rrule(rrulebase):
             dtstart = datetime.datetime.fromordinal(dtstart.toordinal())
         else:
             dtstart = dtstart.replace(microsecond=0)
+        if dateonly:
+            if (freq > DAILY or byhour is not None or byminute is not None or
+                    bysecond is not None):
+                raise ValueError("dateonly rules must have a frequency of at "
+                                 "most DAILY and no byhour, byminute or "
+                                 "bysecond")
+            dtstart = datetime.datetime.fromordinal(dtstart.toordinal())
+        self._dateonly = dateonly
         self._dtstart = dtstart
         self._tzinfo = dtstart.tzinfo
         self._freq = freq
@@ -440,7 +518,7 @@ class rrule(rrulebase):
         # been supplied (the string retrieval will just use .get())
         self._original_rule = {}
 
-        if until and not isinstance(until, datetime.datetime):
+        if until and (dateonly or not isinstance(until, datetime.datetime)):
             until = datetime.datetime.fromordinal(until.toordinal())
         self._until = until
 
@@ -669,6 +747,115 @@ class rrule(rrulebase):
             self._timeset.sort()
             self._timeset = tuple(self._timeset)
 
+        self._periodinfo = _periodinfo.build(self)
+
+    def __getitem__(self, item):
+        if (self._periodinfo is not None and not self._cache_complete and
+                isinstance(item, integer_types)):
+            if item < 0:
+                n = self._closed_len()
+                if n is not None:
+                    if item + n < 0:
+                        raise IndexError
+                    return self._closed_item(item + n)
+            else:
+                res = self._closed_item(item)
+                if res is not None:
+                    return res
+
+        return super(rrule, self).__getitem__(item)
+
+    def __contains__(self, item):
+        pi = self._periodinfo
+        dt = item
+        if self._dateonly:
+            # Date only rules hold no datetimes
+            if isinstance(item, datetime.datetime):
+                return False
+            dt = None
+            if isinstance(item, datetime.date):
+                dt = datetime.datetime.fromordinal(item.toordinal())
+        if (pi is not None and not self._cache_complete and
+                isinstance(dt, datetime.datetime) and
+                dt.tzinfo is self._tzinfo):
+            n = pi.rank(dt)
+            res = pi.nth(n) if n is not None else None
+            if res is not None:
+                return (res == dt and
+                        not (self._count and n >= self._count) and
+                        not (self._until and dt > self._until))
+
+        return super(rrule, self).__contains__(item)
+
+    def count(self):
+        """ Returns the number of recurrences in this set. Simple rules
+            limited by count or until get it without iterating, the others
+            have to go through the whole recurrence, if this hasn't been done
+            before. """
+        if (self._len is None and self._periodinfo is not None and
+                not self._cache_complete):
+            self._len = self._closed_len()
+        return super(rrule, self).count()
+
+    def _closed_item(self, n):
+        """ Recurrence of index n >= 0 by _periodinfo, None if unknown """
+        if self._count and n >= self._count:
+            raise IndexError
+        res = self._periodinfo.nth(n)
+        if res is not None and self._until and res > self._until:
+            raise IndexError
+        if res is not None and self._dateonly:
+            res = res.date()
+        return res
+
+    def _closed_ordinals(self):
+        """ Generator of the day ordinals of a date only rule by _periodinfo.
+            What comes after maxyear is left to the iteration. """
+        pi = self._periodinfo
+        count = self._count
+        until = self._until and self._until.toordinal()
+        total = 0
+        period = 0
+        days = pi.days(period)
+        skip = pi.skip
+        while days is not None:
+            for day in days[skip:]:
+                if until and day > until:
+                    self._len = total
+                    return
+                total += 1
+                yield day
+                if count and total == count:
+                    self._len = total
+                    return
+            skip = 0
+            period += 1
+            days = pi.days(period)
+
+        for day in itertools.islice(self._iterrule(True), total, None):
+            yield day
+
+    def _closed_len(self):
+        """ Number of recurrences by _periodinfo, None if unknown """
+        pi = self._periodinfo
+        if self._until is None:
+            if self._count and pi.nth(self._count - 1) is not None:
+                return self._count
+            return None
+
+        if self._until.tzinfo is not self._tzinfo:
+            return None
+
+        n = pi.rank(self._until)
+        res = pi.nth(n) if n is not None else None
+        if res is None:
+            return None
+        if res == self._until:
+            n += 1
+        if self._count:
+            n = min(n, self._count)
+        return n
+
     def __str__(self):
         """
         Output a string that would generate this RRULE if passed to rrulestr.
@@ -740,13 +927,27 @@ class rrule(rrulebase):
                       "freq": self._freq,
                       "until": self._until,
                       "wkst": self._wkst,
-                      "cache": False if self._cache is None else True }
+                      "cache": False if self._cache is None else True,
+                      "dateonly": self._dateonly}
         new_kwargs.update(self._original_rule)
         new_kwargs.update(kwargs)
         return rrule(**new_kwargs)
 
 
-    def _iter(self):
+    def ordinals(self):
+        if self._dateonly and self._cache is None:
+            return self._iter(ordinals=True)
+        return super(rrule, self).ordinals()
+
+    def _iter(self, ordinals=False):
+        if not self._dateonly or self._periodinfo is None:
+            return self._iterrule(ordinals)
+        elif ordinals:
+            return self._closed_ordinals()
+        return (datetime.date.fromordinal(day)
+                for day in self._closed_ordinals())
+
+    def _iterrule(self, ordinals=False):
         year, month, day, hour, minute, second, weekday, yearday, _ = \
             self._dtstart.timetuple()
 
@@ -766,6 +967,10 @@ class rrule(rrulebase):
         byhour = self._byhour
         byminute = self._byminute
         bysecond = self._bysecond
+        dateonly = self._dateonly
+        if dateonly:
+            dtstart = self._dtstart.toordinal()
+            until = until and until.toordinal()
 
         ii = _iterinfo(self)
         ii.rebuild(year, month)
@@ -820,7 +1025,29 @@ class rrule(rrulebase):
                     filtered = True
 
             # Output results
-            if bysetpos and timeset:
+            if dateonly:
+                days = [ii.yearordinal + i for i in dayset[start:end]
+                        if i is not None]
+                if bysetpos:
+                    days = sorted(set(days[pos-1 if pos > 0 else pos]
+                                      for pos in bysetpos
+                                      if -len(days) <= pos <= len(days)))
+                for res in days:
+                    if until and res > until:
+                        self._len = total
+                        return
+                    elif res >= dtstart:
+                        total += 1
+                        if ordinals:
+                            yield res
+                        else:
+                            yield datetime.date.fromordinal(res)
+                        if count:
+                            count -= 1
+                            if not count:
+                                self._len = total
+                                return
+            elif bysetpos and timeset:
                 poslist = []
                 for pos in bysetpos:
                     if pos < 0:
@@ -1081,6 +1308,133 @@ class rrule(rrulebase):
                 return (accumulator, value)
 
 
+class _masklru(object):
+    """ LRU cache of the year masks built by _iterinfo.rebuild. The masks
+    only depend on the year and a few rule parameters, so they are shared
+    by all rrule instances instead of being rebuilt by each of them. """
+
+    def __init__(self, size=512):
+        self.size = size
+        self._masks = OrderedDict()
+        self._lock = _thread.allocate_lock()
+
+    def __call__(self, build, *args):
+        key = (build,) + args
+        with self._lock:
+            mask = self._masks.pop(key, None)
+            if mask is None:
+                mask = build(*args)
+                if len(self._masks) >= self.size:
+                    self._masks.popitem(last=False)
+            self._masks[key] = mask
+        return mask
+
+_masks = _masklru()
+
+
+def _wnomask(year, wkst, byweekno):
+    yearlen = 365 + calendar.isleap(year)
+    yearweekday = datetime.date(year, 1, 1).weekday()
+    wdaymask = WDAYMASK[yearweekday:]
+    wnomask = [0]*(yearlen+7)
+    # no1wkst = firstwkst = wdaymask.index(wkst)
+    no1wkst = firstwkst = (7-yearweekday+wkst) % 7
+    if no1wkst >= 4:
+        no1wkst = 0
+        # Number of days in the year, plus the days we got
+        # from last year.
+        wyearlen = yearlen+(yearweekday-wkst) % 7
+    else:
+        # Number of days in the year, minus the days we
+        # left in last year.
+        wyearlen = yearlen-no1wkst
+    div, mod = divmod(wyearlen, 7)
+    numweeks = div+mod//4
+    for n in byweekno:
+        if n < 0:
+            n += numweeks+1
+        if not (0 < n <= numweeks):
+            continue
+        if n > 1:
+            i = no1wkst+(n-1)*7
+            if no1wkst != firstwkst:
+                i -= 7-firstwkst
+        else:
+            i = no1wkst
+        for j in range(7):
+            wnomask[i] = 1
+            i += 1
+            if wdaymask[i] == wkst:
+                break
+    if 1 in byweekno:
+        # Check week number 1 of next year as well
+        # TODO: Check -numweeks for next year.
+        i = no1wkst+numweeks*7
+        if no1wkst != firstwkst:
+            i -= 7-firstwkst
+        if i < yearlen:
+            # If week starts in next year, we
+            # don't care about it.
+            for j in range(7):
+                wnomask[i] = 1
+                i += 1
+                if wdaymask[i] == wkst:
+                    break
+    if no1wkst:
+        # Check last week number of last year as
+        # well. If no1wkst is 0, either the year
+        # started on week start, or week number 1
+        # got days from last year, so there are no
+        # days from last year's last week number in
+        # this year.
+        if -1 not in byweekno:
+            lyearweekday = datetime.date(year-1, 1, 1).weekday()
+            lno1wkst = (7-lyearweekday+wkst) % 7
+            lyearlen = 365+calendar.isleap(year-1)
+            if lno1wkst >= 4:
+                lno1wkst = 0
+                lnumweeks = 52+(lyearlen +
+                                (lyearweekday-wkst) % 7) % 7//4
+            else:
+                lnumweeks = 52+(yearlen-no1wkst) % 7//4
+        else:
+            lnumweeks = -1
+        if lnumweeks in byweekno:
+            for i in range(no1wkst):
+                wnomask[i] = 1
+    return tuple(wnomask)
+
+
+def _nwdaymask(year, ranges, bynweekday):
+    # Weekly frequency won't get here, so we may not
+    # care about cross-year weekly periods.
+    yearlen = 365 + calendar.isleap(year)
+    wdaymask = WDAYMASK[datetime.date(year, 1, 1).weekday():]
+    nwdaymask = [0]*yearlen
+    for first, last in ranges:
+        last -= 1
+        for wday, n in bynweekday:
+            if n < 0:
+                i = last+(n+1)*7
+                i -= (wdaymask[i]-wday) % 7
+            else:
+                i = first+(n-1)*7
+                i += (7-wdaymask[i]+wday) % 7
+            if first <= i <= last:
+                nwdaymask[i] = 1
+    return tuple(nwdaymask)
+
+
+def _eastermask(year, byeaster):
+    yearlen = 365 + calendar.isleap(year)
+    eastermask = [0]*(yearlen+7)
+    eyday = (easter.easter(year).toordinal() -
+             datetime.date(year, 1, 1).toordinal())
+    for offset in byeaster:
+        eastermask[eyday+offset] = 1
+    return tuple(eastermask)
+
+
 class _iterinfo(object):
     __slots__ = ["rrule", "lastyear", "lastmonth",
                  "yearlen", "nextyearlen", "yearordinal", "yearweekday",
@@ -1119,105 +1473,23 @@ class _iterinfo(object):
             if not rr._byweekno:
                 self.wnomask = None
             else:
-                self.wnomask = [0]*(self.yearlen+7)
-                # no1wkst = firstwkst = self.wdaymask.index(rr._wkst)
-                no1wkst = firstwkst = (7-self.yearweekday+rr._wkst) % 7
-                if no1wkst >= 4:
-                    no1wkst = 0
-                    # Number of days in the year, plus the days we got
-                    # from last year.
-                    wyearlen = self.yearlen+(self.yearweekday-rr._wkst) % 7
-                else:
-                    # Number of days in the year, minus the days we
-                    # left in last year.
-                    wyearlen = self.yearlen-no1wkst
-                div, mod = divmod(wyearlen, 7)
-                numweeks = div+mod//4
-                for n in rr._byweekno:
-                    if n < 0:
-                        n += numweeks+1
-                    if not (0 < n <= numweeks):
-                        continue
-                    if n > 1:
-                        i = no1wkst+(n-1)*7
-                        if no1wkst != firstwkst:
-                            i -= 7-firstwkst
-                    else:
-                        i = no1wkst
-                    for j in range(7):
-                        self.wnomask[i] = 1
-                        i += 1
-                        if self.wdaymask[i] == rr._wkst:
-                            break
-                if 1 in rr._byweekno:
-                    # Check week number 1 of next year as well
-                    # TODO: Check -numweeks for next year.
-                    i = no1wkst+numweeks*7
-                    if no1wkst != firstwkst:
-                        i -= 7-firstwkst
-                    if i < self.yearlen:
-                        # If week starts in next year, we
-                        # don't care about it.
-                        for j in range(7):
-                            self.wnomask[i] = 1
-                            i += 1
-                            if self.wdaymask[i] == rr._wkst:
-                                break
-                if no1wkst:
-                    # Check last week number of last year as
-                    # well. If no1wkst is 0, either the year
-                    # started on week start, or week number 1
-                    # got days from last year, so there are no
-                    # days from last year's last week number in
-                    # this year.
-                    if -1 not in rr._byweekno:
-                        lyearweekday = datetime.date(year-1, 1, 1).weekday()
-                        lno1wkst = (7-lyearweekday+rr._wkst) % 7
-                        lyearlen = 365+calendar.isleap(year-1)
-                        if lno1wkst >= 4:
-                            lno1wkst = 0
-                            lnumweeks = 52+(lyearlen +
-                                            (lyearweekday-rr._wkst) % 7) % 7//4
-                        else:
-                            lnumweeks = 52+(self.yearlen-no1wkst) % 7//4
-                    else:
-                        lnumweeks = -1
-                    if lnumweeks in rr._byweekno:
-                        for i in range(no1wkst):
-                            self.wnomask[i] = 1
-
-        if (rr._bynweekday and (month != self.lastmonth or
-                                year != self.lastyear)):
-            ranges = []
-            if rr._freq == YEARLY:
-                if rr._bymonth:
-                    for month in rr._bymonth:
-                        ranges.append(self.mrange[month-1:month+1])
+                self.wnomask = _masks(_wnomask, year, rr._wkst,
+                                      rr._byweekno)
+
+            if rr._bynweekday:
+                if rr._freq == YEARLY and not rr._bymonth:
+                    ranges = ((0, self.yearlen),)
                 else:
-                    ranges = [(0, self.yearlen)]
-            elif rr._freq == MONTHLY:
-                ranges = [self.mrange[month-1:month+1]]
-            if ranges:
-                # Weekly frequency won't get here, so we may not
-                # care about cross-year weekly periods.
-                self.nwdaymask = [0]*self.yearlen
-                for first, last in ranges:
-                    last -= 1
-                    for wday, n in rr._bynweekday:
-                        if n < 0:
-                            i = last+(n+1)*7
-                            i -= (self.wdaymask[i]-wday) % 7
-                        else:
-                            i = first+(n-1)*7
-                            i += (7-self.wdaymask[i]+wday) % 7
-                        if first <= i <= last:
-                            self.nwdaymask[i] = 1
+                    # A monthly rule only looks at the days of the current
+                    # month, so one mask covering every month serves the
+                    # whole year.
+                    ranges = tuple(self.mrange[month-1:month+1]
+                                   for month in rr._bymonth or range(1, 13))
+                self.nwdaymask = _masks(_nwdaymask, year, ranges,
+                                        rr._bynweekday)
 
-        if rr._byeaster:
-            self.eastermask = [0]*(self.yearlen+7)
-            eyday = easter.easter(year).toordinal()-self.yearordinal
-            for offset in rr._byeaster:
-                self.eastermask[eyday+offset] = 1
+            if rr._byeaster:
+                self.eastermask = _masks(_eastermask, year, rr._byeaster)
 
         self.lastyear = year
         self.lastmonth = month
@@ -1276,50 +1548,222 @@ class _iterinfo(object):
                 tzinfo=self.rrule._tzinfo),)
 
 
-class rruleset(rrulebase):
-    """ The rruleset type allows more complex recurrence setups, mixing
-    multiple rules, dates, exclusion rules, and exclusion dates. The type
-    constructor takes the following keyword arguments:
-
-    :param cache: If True, caching of results will be enabled, improving
-                  performance of multiple queries considerably. """
+class _periodinfo(object):
+    """
+    Recurrences of simple rules computed arithmetically instead of iterating
+    the rule. Simple rules are DAILY and WEEKLY rules with at most plain
+    weekdays, MONTHLY and YEARLY rules with month days which every month has
+    or nth weekdays which every period has, and no other BYXXX than bymonth
+    (for YEARLY) and the times. Such rules have the same number of
+    recurrences in every frequency period (every `interval` months for
+    MONTHLY, etc.).
+
+    Periods and days are counted from the one of dtstart; days are ordinals.
+    """
+    __slots__ = ["rrule", "freq", "interval", "timeset", "daycount", "skip",
+                 "start", "steps", "offsets", "months", "monthdays",
+                 "nweekdays"]
 
-    class _genitem(object):
-        def __init__(self, genlist, gen):
-            try:
-                self.dt = advance_iterator(gen)
-                genlist.append(self)
-            except StopIteration:
-                pass
-            self.genlist = genlist
-            self.gen = gen
+    # No periods are computed after this year, leaving what happens at the
+    # end of the supported dates to the iteration.
+    maxyear = datetime.MAXYEAR - 1
 
-        def __next__(self):
-            try:
-                self.dt = advance_iterator(self.gen)
-            except StopIteration:
-                if self.genlist[0] is self:
-                    heapq.heappop(self.genlist)
-                else:
-                    self.genlist.remove(self)
-                    heapq.heapify(self.genlist)
+    def __init__(self, rrule):
+        for attr in self.__slots__:
+            setattr(self, attr, None)
+        self.rrule = rrule
 
-        next = __next__
+    @classmethod
+    def build(cls, rr):
+        """ Returns the _periodinfo of rrule rr, None if it is not simple """
+        freq = rr._freq
+        if (freq > DAILY or rr._bysetpos or rr._byweekno or rr._byyearday or
+                rr._byeaster):
+            return None
+
+        monthdays = rr._bymonthday or rr._bynmonthday
+        if rr._bymonthday and rr._bynmonthday:
+            return None
+        if [d for d in monthdays if not -28 <= d <= 28]:
+            return None
+
+        pi = cls(rr)
+        pi.freq = freq
+        pi.interval = rr._interval
+        pi.timeset = rr._timeset
+        dtstart = rr._dtstart
+        o0 = dtstart.toordinal()
+
+        if freq >= WEEKLY:
+            if rr._bymonth or monthdays or rr._bynweekday:
+                return None
+            if freq == DAILY:
+                # Weekdays repeat after `steps` intervals
+                steps = 7 // gcd(pi.interval, 7)
+                wdays = rr._byweekday or range(7)
+                pi.start = o0
+                pi.steps = steps
+                pi.offsets = [j*pi.interval for j in range(steps)
+                              if (o0 + j*pi.interval + 6) % 7 in wdays]
+            else:
+                if not rr._byweekday:
+                    return None
+                pi.start = o0 - (dtstart.weekday() - rr._wkst) % 7
+                pi.offsets = sorted((wday - rr._wkst) % 7
+                                    for wday in rr._byweekday)
+            if not pi.offsets:
+                return None
+            days = len(pi.offsets)
+        else:
+            if rr._byweekday or bool(monthdays) == bool(rr._bynweekday):
+                return None
+            if freq == MONTHLY:
+                if rr._bymonth:
+                    return None
+                pi.start = dtstart.year*12 + dtstart.month - 1
+            else:
+                pi.start = dtstart.year
+                pi.months = rr._bymonth
+
+            if monthdays:
+                pi.monthdays = monthdays
+                if freq == YEARLY and not pi.months:
+                    pi.months = range(1, 13)
+                maxn = None
+            else:
+                pi.nweekdays = rr._bynweekday
+                # With YEARLY and no bymonth, n counts weekdays of the year
+                maxn = 52 if freq == YEARLY and not pi.months else 4
+                signs = set(n > 0 for wday, n in pi.nweekdays)
+                if (len(signs) > 1 or
+                        [n for wday, n in pi.nweekdays if abs(n) > maxn]):
+                    return None
+            days = (len(pi.monthdays or pi.nweekdays) *
+                    len(pi.months or (None,)))
+
+        pi.daycount = days * len(pi.timeset)
+
+        # Recurrences of the first period which are before dtstart
+        days = pi.days(0)
+        if days is None:
+            return None
+        pi.skip = 0
+        for day in days:
+            date = datetime.date.fromordinal(day)
+            for time in pi.timeset:
+                if datetime.datetime.combine(date, time) < dtstart:
+                    pi.skip += 1
+
+        return pi
+
+    def days(self, period):
+        """ Sorted ordinals of the days of a period, None after maxyear """
+        freq = self.freq
+        if freq >= WEEKLY:
+            if freq == DAILY:
+                start = self.start + period*self.steps*self.interval
+            else:
+                start = self.start + period*7*self.interval
+            if start + 7 > datetime.date(self.maxyear, 12, 31).toordinal():
+                return None
+            return [start + offset for offset in self.offsets]
+
+        if freq == MONTHLY:
+            year, month = divmod(self.start + period*self.interval, 12)
+            ranges = [(year, month + 1)]
+        else:
+            year = self.start + period*self.interval
+            ranges = [(year, month) for month in self.months or (None,)]
+        if year > self.maxyear:
+            return None
+
+        days = []
+        for year, month in ranges:
+            if month is None:
+                first = datetime.date(year, 1, 1).toordinal()
+                last = datetime.date(year, 12, 31).toordinal()
+            else:
+                first = datetime.date(year, month, 1).toordinal()
+                last = first + calendar.monthrange(year, month)[1] - 1
 
-        def __lt__(self, other):
-            return self.dt < other.dt
+            if self.monthdays:
+                for day in self.monthdays:
+                    days.append(first + day - 1 if day > 0 else last + day + 1)
+            else:
+                for wday, n in self.nweekdays:
+                    if n < 0:
+                        days.append(last + (n + 1)*7 -
+                                    (last + 6 - wday) % 7)
+                    else:
+                        days.append(first + (n - 1)*7 +
+                                    (wday - first - 6) % 7)
+        days.sort()
+        return days
+
+    def period(self, ordinal):
+        """ Period of the day of the given ordinal """
+        freq = self.freq
+        if freq == DAILY:
+            return (ordinal - self.start) // (self.steps*self.interval)
+        elif freq == WEEKLY:
+            return (ordinal - self.start) // (7*self.interval)
+
+        date = datetime.date.fromordinal(ordinal)
+        if freq == MONTHLY:
+            month = date.year*12 + date.month - 1
+            return (month - self.start) // self.interval
+        return (date.year - self.start) // self.interval
+
+    def nth(self, n):
+        """ Recurrence of index n >= 0, regardless of count and until. None
+            if it is after maxyear. """
+        period, i = divmod(n + self.skip, self.daycount)
+        days = self.days(period)
+        if days is None:
+            return None
+        day, time = divmod(i, len(self.timeset))
+        return datetime.datetime.combine(datetime.date.fromordinal(days[day]),
+                                         self.timeset[time])
+
+    def rank(self, dt):
+        """ Number of recurrences before dt, regardless of count and until.
+            None if dt is after maxyear. """
+        ordinal = dt.toordinal()
+        period = self.period(ordinal)
+        if period < 0:
+            return 0
+
+        days = self.days(period)
+        if days is None:
+            return None
+
+        n = period*self.daycount - self.skip
+        for day in days:
+            if day < ordinal:
+                n += len(self.timeset)
+            elif day == ordinal:
+                date = datetime.date.fromordinal(day)
+                for time in self.timeset:
+                    if datetime.datetime.combine(date, time) < dt:
+                        n += 1
+        return max(n, 0)
 
-        def __gt__(self, other):
-            return self.dt > other.dt
 
-        def __eq__(self, other):
-            return self.dt == other.dt
+class rruleset(rrulebase):
+    """ The rruleset type allows more complex recurrence setups, mixing
+    multiple rules, dates, exclusion rules, and exclusion dates. The type
+    constructor takes the following keyword arguments:
 
-        def __ne__(self, other):
-            return self.dt != other.dt
+    :param cache: If True, caching of results will be enabled, improving
+                  performance of multiple queries considerably.
+    :param dateonly: If True, the set is made of ``datetime.date`` instances.
+                     Its rules must be date only rrules, and the dates given
+                     to rdate and exdate are stripped of their time. Sets
+                     without it do not accept date only rrules. """
 
-    def __init__(self, cache=False):
+    def __init__(self, cache=False, dateonly=False):
         super(rruleset, self).__init__(cache)
+        self._dateonly = dateonly
         self._rrule = []
         self._rdate = []
         self._exrule = []
@@ -1329,13 +1773,14 @@ class rruleset(rrulebase):
     def rrule(self, rrule):
         """ Include the given :py:class:`rrule` instance in the recurrence set
             generation. """
+        self._check_dateonly(rrule)
         self._rrule.append(rrule)
 
     @_invalidates_cache
     def rdate(self, rdate):
         """ Include the given :py:class:`datetime` instance in the recurrence
             set generation. """
-        self._rdate.append(rdate)
+        self._rdate.append(self._date(rdate))
 
     @_invalidates_cache
     def exrule(self, exrule):
@@ -1343,6 +1788,7 @@ class rruleset(rrulebase):
             list. Dates which are part of the given recurrence rules will not
             be generated, even if some inclusive rrule or rdate matches them.
         """
+        self._check_dateonly(exrule)
         self._exrule.append(exrule)
 
     @_invalidates_cache
@@ -1350,38 +1796,39 @@ class rruleset(rrulebase):
         """ Include the given datetime instance in the recurrence set
             exclusion list. Dates included that way will not be generated,
             even if some inclusive rrule or rdate matches them. """
-        self._exdate.append(exdate)
+        self._exdate.append(self._date(exdate))
+
+    def _check_dateonly(self, rrule):
+        if self._dateonly and not rrule._dateonly:
+            raise ValueError("dateonly sets only accept dateonly rules")
+        if not self._dateonly and rrule._dateonly:
+            raise ValueError("dateonly rules need a dateonly set")
+
+    def _date(self, dt):
+        if self._dateonly and isinstance(dt, datetime.datetime):
+            return dt.date()
+        return dt
 
     def _iter(self):
-        rlist = []
         self._rdate.sort()
-        self._genitem(rlist, iter(self._rdate))
-        for gen in [iter(x) for x in self._rrule]:
-            self._genitem(rlist, gen)
-        exlist = []
-        self._exdate.sort()
-        self._genitem(exlist, iter(self._exdate))
-        for gen in [iter(x) for x in self._exrule]:
-            self._genitem(exlist, gen)
+        rlist = [iter(self._rdate)] + [iter(x) for x in self._rrule]
+        exdate = set(self._exdate)
+        exlist = heapq.merge(*self._exrule)
+        exdt = next(exlist, None)
         lastdt = None
         total = 0
-        heapq.heapify(rlist)
-        heapq.heapify(exlist)
-        while rlist:
-            ritem = rlist[0]
-            if not lastdt or lastdt != ritem.dt:
-                while exlist and exlist[0] < ritem:
-                    exitem = exlist[0]
-                    advance_iterator(exitem)
-                    if exlist and exlist[0] is exitem:
-                        heapq.heapreplace(exlist, exitem)
-                if not exlist or ritem != exlist[0]:
-                    total += 1
-                    yield ritem.dt
-                lastdt = ritem.dt
-            advance_iterator(ritem)
-            if rlist and rlist[0] is ritem:
-                heapq.heapreplace(rlist, ritem)
+        for dt in heapq.merge(*rlist):
+            if dt == lastdt:
+                continue
+            lastdt = dt
+            if dt in exdate:
+                continue
+            while exdt is not None and exdt < dt:
+                exdt = next(exlist, None)
+            if exdt is not None and exdt == dt:
+                continue
+            total += 1
+            yield dt
         self._len = total
 
 
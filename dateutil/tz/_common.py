@@ -4,7 +4,13 @@ from six.moves import _thread
 from datetime import datetime, timedelta, tzinfo
 import copy
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 ZERO = timedelta(0)
+EPOCH = datetime(1970, 1, 1)
 
 __all__ = ['tzname_in_python2', 'enfold']
 
@@ -124,6 +130,60 @@ class _tzinfo(tzinfo):
         
         return same_dt and not same_offset
 
+    def utcoffsets(self, timestamps):
+        """
+        The UTC offsets of many instants at once, equivalent to
+        ``tz.fromutc(dt).utcoffset()`` for each of them.
+
+        :param timestamps:
+            A sequence of instants in seconds since the epoch (UTC),
+            preferably a NumPy ``int64`` array.
+
+        :return:
+            Returns the UTC offsets in seconds, as a NumPy array if NumPy is
+            installed, otherwise as a list.
+
+        .. versionadded:: 2.7.0
+        """
+        offsets = []
+        for ts in timestamps:
+            dt = (EPOCH + timedelta(seconds=int(ts))).replace(tzinfo=self)
+            offsets.append(_offset_seconds(self.fromutc(dt).utcoffset()))
+
+        return _result_array(offsets, 'int64')
+
+    def localize_many(self, timestamps, fold=0):
+        """
+        Resolve many "wall times" at once, equivalent to calling
+        ``utcoffset()`` and :func:`is_ambiguous` for each of them.
+
+        :param timestamps:
+            A sequence of wall times as seconds since the epoch (as if the
+            naive datetimes were in UTC), preferably a NumPy ``int64`` array.
+
+        :param fold:
+            The ``fold`` used for ambiguous times, either a single value or a
+            sequence of values for every timestamp.
+
+        :return:
+            Returns a tuple of the UTC offsets in seconds and the ambiguity
+            flags, as NumPy arrays if NumPy is installed, otherwise as lists.
+
+        .. versionadded:: 2.7.0
+        """
+        timestamps = list(timestamps)
+        folds = _fold_list(fold, len(timestamps))
+        offsets = []
+        ambiguous = []
+        for ts, f in zip(timestamps, folds):
+            dt = (EPOCH + timedelta(seconds=int(ts))).replace(tzinfo=self)
+            dt = enfold(dt, fold=int(f))
+            offsets.append(_offset_seconds(dt.utcoffset()))
+            ambiguous.append(bool(self.is_ambiguous(dt)))
+
+        return (_result_array(offsets, 'int64'),
+                _result_array(ambiguous, 'bool'))
+
     def _fold_status(self, dt_utc, dt_wall):
         """
         Determine the fold status of a "wall" datetime, given a representation
@@ -302,6 +362,69 @@ class tzrangebase(_tzinfo):
 
         return enfold(dt_wall, fold=_fold)
 
+    def utcoffsets(self, timestamps):
+        if numpy is None:
+            return super(tzrangebase, self).utcoffsets(timestamps)
+
+        ts = numpy.asarray(timestamps, dtype='int64')
+        std_offset = _offset_seconds(self._std_offset)
+        if not self.hasdst:
+            return numpy.full(ts.shape, std_offset, dtype='int64')
+
+        # Transitions of the year of each UTC time, in UTC
+        dston, dstoff = self._transitions_many(ts)
+        dston -= std_offset
+        dstoff -= std_offset
+        isdst = self._naive_isdst_many(ts, dston, dstoff)
+
+        return numpy.where(isdst, _offset_seconds(self._dst_offset),
+                           std_offset)
+
+    def localize_many(self, timestamps, fold=0):
+        if numpy is None:
+            return super(tzrangebase, self).localize_many(timestamps, fold)
+
+        ts = numpy.asarray(timestamps, dtype='int64')
+        std_offset = _offset_seconds(self._std_offset)
+        if not self.hasdst:
+            return (numpy.full(ts.shape, std_offset, dtype='int64'),
+                    numpy.zeros(ts.shape, dtype='bool'))
+
+        dston, dstoff = self._transitions_many(ts)
+        isdst = self._naive_isdst_many(ts, dston, dstoff)
+        ambiguous = ((dstoff <= ts) &
+                     (ts < dstoff + _offset_seconds(self._dst_base_offset)))
+
+        # Handle ambiguous dates
+        infold = numpy.asarray(fold, dtype='bool')
+        isdst = numpy.where(~isdst & ambiguous, ~infold, isdst)
+
+        offsets = numpy.where(isdst, _offset_seconds(self._dst_offset),
+                              std_offset)
+        return offsets.astype('int64'), ambiguous
+
+    def _transitions_many(self, ts):
+        """
+        The DST on and off transitions (as timestamps) of the year of every
+        timestamp in the ``ts`` array.
+        """
+        years = ts.astype('datetime64[s]').astype('datetime64[Y]')
+        years, inverse = numpy.unique(years.astype('int64') + 1970,
+                                      return_inverse=True)
+        dston = numpy.empty(len(years), dtype='int64')
+        dstoff = numpy.empty(len(years), dtype='int64')
+        for i, year in enumerate(years):
+            on, off = self.transitions(int(year))
+            dston[i] = _offset_seconds(on - EPOCH)
+            dstoff[i] = _offset_seconds(off - EPOCH)
+
+        return dston[inverse], dstoff[inverse]
+
+    def _naive_isdst_many(self, ts, dston, dstoff):
+        return numpy.where(dston < dstoff,
+                           (dston <= ts) & (ts < dstoff),
+                           ~((dstoff <= ts) & (ts < dston)))
+
     def is_ambiguous(self, dt):
         """
         Whether or not the "wall time" of a given datetime is ambiguous in this
@@ -346,10 +469,9 @@ class tzrangebase(_tzinfo):
             return isdst
 
     def _naive_isdst(self, dt, transitions):
+        # dt is naive, both callers strip the time zone already
         dston, dstoff = transitions
 
-        dt = dt.replace(tzinfo=None)
-
         if dston < dstoff:
             isdst = dston <= dt < dstoff
         else:
@@ -372,6 +494,35 @@ class tzrangebase(_tzinfo):
     __reduce__ = object.__reduce__
 
 
+def _offset_seconds(td):
+    return td.days * 86400 + td.seconds
+
+
+def _result_array(values, dtype):
+    if numpy is None:
+        return values
+
+    return numpy.array(values, dtype=dtype)
+
+
+def _fixed_offsets(timestamps, offset):
+    """ utcoffsets() and localize_many() result for fixed offset zones """
+    if numpy is None:
+        length = len(list(timestamps))
+        return [offset] * length, [False] * length
+
+    shape = numpy.shape(timestamps)
+    return (numpy.full(shape, offset, dtype='int64'),
+            numpy.zeros(shape, dtype='bool'))
+
+
+def _fold_list(fold, length):
+    try:
+        return list(fold)
+    except TypeError:
+        return [fold] * length
+
+
 def _total_seconds(td):
     # Python 2.6 doesn't have a total_seconds() method on timedelta objects
     return ((td.seconds + td.days * 86400) * 1000000 +
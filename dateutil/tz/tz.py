@@ -14,24 +14,41 @@ import sys
 import os
 import bisect
 import copy
+import weakref
 
+from array import array
+from collections import OrderedDict
 from operator import itemgetter
 
 from contextlib import contextmanager
 
 from six import string_types, PY3
+from six.moves import _thread
 from ._common import tzname_in_python2, _tzinfo, _total_seconds
-from ._common import tzrangebase, enfold
+from ._common import tzrangebase, enfold, _offset_seconds, _fixed_offsets
 
 try:
     from .win import tzwin, tzwinlocal
 except ImportError:
     tzwin = tzwinlocal = None
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 ZERO = datetime.timedelta(0)
 EPOCH = datetime.datetime.utcfromtimestamp(0)
 EPOCHORDINAL = EPOCH.toordinal()
 
+# Python 2 arrays have no 64-bit integer type; doubles hold the transition
+# times exactly.
+try:
+    array('q')
+    _TRANS_TYPECODE = 'q'
+except ValueError:
+    _TRANS_TYPECODE = 'd'
+
 class tzutc(datetime.tzinfo):
     """
     This is a tzinfo object that represents the UTC time zone.
@@ -46,6 +63,20 @@ class tzutc(datetime.tzinfo):
     def tzname(self, dt):
         return "UTC"
 
+    def utcoffsets(self, timestamps):
+        """
+        The UTC offsets (in seconds) of many instants at once, see
+        :func:`dateutil.tz.tzfile.utcoffsets`.
+        """
+        return _fixed_offsets(timestamps, 0)[0]
+
+    def localize_many(self, timestamps, fold=0):
+        """
+        The UTC offsets (in seconds) and ambiguity flags of many wall times
+        at once, see :func:`dateutil.tz.tzfile.localize_many`.
+        """
+        return _fixed_offsets(timestamps, 0)
+
     def is_ambiguous(self, dt):
         """
         Whether or not the "wall time" of a given datetime is ambiguous in this
@@ -107,6 +138,20 @@ class tzoffset(datetime.tzinfo):
     def dst(self, dt):
         return ZERO
 
+    def utcoffsets(self, timestamps):
+        """
+        The UTC offsets (in seconds) of many instants at once, see
+        :func:`dateutil.tz.tzfile.utcoffsets`.
+        """
+        return _fixed_offsets(timestamps, _offset_seconds(self._offset))[0]
+
+    def localize_many(self, timestamps, fold=0):
+        """
+        The UTC offsets (in seconds) and ambiguity flags of many wall times
+        at once, see :func:`dateutil.tz.tzfile.localize_many`.
+        """
+        return _fixed_offsets(timestamps, _offset_seconds(self._offset))
+
     def is_ambiguous(self, dt):
         """
         Whether or not the "wall time" of a given datetime is ambiguous in this
@@ -315,7 +360,8 @@ class _tzfile(object):
     information read from binary tzfiles.
     """
     attrs = ['trans_list', 'trans_idx', 'ttinfo_list',
-             'ttinfo_std', 'ttinfo_dst', 'ttinfo_before', 'ttinfo_first']
+             'ttinfo_std', 'ttinfo_dst', 'ttinfo_before', 'ttinfo_first',
+             'trans_year0', 'trans_year_idx']
 
     def __init__(self, **kwargs):
         for attr in self.attrs:
@@ -589,7 +635,22 @@ class tzfile(_tzinfo):
             out.trans_idx[i] = tti
 
         out.trans_idx = tuple(out.trans_idx)
-        out.trans_list = tuple(out.trans_list)
+        out.trans_list = array(_TRANS_TYPECODE, out.trans_list)
+
+        # For every year between the first and the last transition, store
+        # the number of transitions up to its start (in wall time), so
+        # lookups only have to check the transitions within the year.
+        out.trans_year0 = None
+        out.trans_year_idx = array('i')
+        if out.trans_list:
+            first = _timestamp_to_datetime(out.trans_list[0]).year
+            last = _timestamp_to_datetime(out.trans_list[-1]).year
+            out.trans_year0 = first
+            for year in range(first, last + 2):
+                start = (datetime.date(year, 1, 1).toordinal() -
+                         EPOCHORDINAL) * 86400
+                out.trans_year_idx.append(
+                    bisect.bisect_right(out.trans_list, start))
 
         return out
 
@@ -602,7 +663,15 @@ class tzfile(_tzinfo):
 
         # Find where the timestamp fits in the transition list - if the
         # timestamp is a transition time, it's part of the "after" period.
-        idx = bisect.bisect_right(self._trans_list, timestamp)
+        # Within the indexed years only the transitions of dt's year need
+        # to be searched.
+        year = dt.year - self._trans_year0
+        if 0 <= year < len(self._trans_year_idx) - 1:
+            idx = bisect.bisect_right(self._trans_list, timestamp,
+                                      self._trans_year_idx[year],
+                                      self._trans_year_idx[year + 1])
+        else:
+            idx = bisect.bisect_right(self._trans_list, timestamp)
 
         # We want to know when the previous transition was, so subtract off 1
         return idx - 1
@@ -674,6 +743,73 @@ class tzfile(_tzinfo):
 
         return self._find_ttinfo(dt).delta
 
+    def utcoffsets(self, timestamps):
+        if numpy is None:
+            return super(tzfile, self).utcoffsets(timestamps)
+
+        # The same steps as _tzinfo.fromutc, on whole arrays
+        ts = numpy.asarray(timestamps, dtype='int64')
+        offset, dst, _ = self._find_ttinfo_many(ts, False)
+        delta = offset - dst
+        wall = ts + delta
+        _, dst_fold, _ = self._find_ttinfo_many(wall, True)
+        wall = numpy.where(delta != 0, wall + dst_fold, ts + dst)
+
+        _, _, ambiguous = self._find_ttinfo_many(wall, False)
+        fold = ambiguous & (wall - ts == delta)
+
+        offset, _, _ = self._find_ttinfo_many(wall, fold)
+        return offset
+
+    def localize_many(self, timestamps, fold=0):
+        if numpy is None:
+            return super(tzfile, self).localize_many(timestamps, fold)
+
+        ts = numpy.asarray(timestamps, dtype='int64')
+        offset, _, ambiguous = self._find_ttinfo_many(ts, fold)
+        return offset, ambiguous
+
+    def _find_ttinfo_many(self, ts, fold):
+        """
+        The array version of _find_ttinfo and is_ambiguous: returns the UTC
+        offsets, DST offsets (in seconds) and ambiguity flags of the wall
+        times in the ``ts`` array.
+        """
+        fold = numpy.asarray(fold, dtype='bool')
+        ntrans = len(self._trans_list)
+        if not ntrans:
+            tti = self._ttinfo_std
+            offset = tti.offset if tti else 0
+            dst = _offset_seconds(tti.dstoffset) if tti and tti.isdst else 0
+            return (numpy.full(ts.shape, offset, dtype='int64'),
+                    numpy.full(ts.shape, dst, dtype='int64'),
+                    numpy.zeros(ts.shape, dtype='bool'))
+
+        # ttinfos by transition index + 1, as returned by _get_ttinfo
+        ttinfos = ([self._ttinfo_before] + list(self._trans_idx[:-1]) +
+                   [self._ttinfo_std])
+        offsets = numpy.array([tti.offset for tti in ttinfos],
+                              dtype='int64')
+        dsts = numpy.array([_offset_seconds(tti.dstoffset)
+                            if tti.isdst else 0 for tti in ttinfos],
+                           dtype='int64')
+        if not self._ttinfo_std:
+            offsets[:] = 0
+        if not self._ttinfo_dst:
+            dsts[:] = 0
+
+        trans_list = numpy.asarray(self._trans_list)
+        idx = numpy.searchsorted(trans_list, ts, side='right') - 1
+
+        # Ambiguous: before the previous offset ends after the transition
+        prev = numpy.maximum(idx, 0)
+        ambiguous = ((idx > 0) &
+                     (ts < trans_list[prev] + offsets[prev] -
+                      offsets[prev + 1]))
+
+        idx = idx - (ambiguous & ~fold)
+        return offsets[idx + 1], dsts[idx + 1], ambiguous
+
     def dst(self, dt):
         if dt is None:
             return None
@@ -838,6 +974,11 @@ class tzrange(tzrangebase):
 
         self._dst_base_offset_ = self._dst_offset - self._std_offset
         self.hasdst = bool(self._start_delta)
+        self._transitions_cache = {}
+
+    # Maximum number of years kept in the transitions cache, unless more
+    # are precomputed
+    _transitions_cache_size = 64
 
     def transitions(self, year):
         """
@@ -856,13 +997,38 @@ class tzrange(tzrangebase):
         if not self.hasdst:
             return None
 
+        try:
+            return self._transitions_cache[year]
+        except KeyError:
+            pass
+
         base_year = datetime.datetime(year, 1, 1)
 
         start = base_year + self._start_delta
         end = base_year + self._end_delta
 
+        if len(self._transitions_cache) >= self._transitions_cache_size:
+            self._transitions_cache.clear()
+        self._transitions_cache[year] = (start, end)
+
         return (start, end)
 
+    def precompute_transitions(self, start_year, end_year):
+        """
+        Compute the DST transitions of the years ``start_year`` to
+        ``end_year`` (inclusive) up front and keep them cached.
+
+        :param start_year:
+            The first year to compute.
+
+        :param end_year:
+            The last year to compute.
+        """
+        self._transitions_cache_size = max(self._transitions_cache_size,
+                                           end_year - start_year + 1)
+        for year in range(start_year, end_year + 1):
+            self.transitions(year)
+
     def __eq__(self, other):
         if not isinstance(other, tzrange):
             return NotImplemented
@@ -1289,78 +1455,156 @@ else:
     TZPATHS = []
 
 
-def gettz(name=None):
-    tz = None
-    if not name:
-        try:
-            name = os.environ["TZ"]
-        except KeyError:
-            pass
-    if name is None or name == ":":
-        for filepath in TZFILES:
-            if not os.path.isabs(filepath):
-                filename = filepath
-                for path in TZPATHS:
-                    filepath = os.path.join(path, filename)
-                    if os.path.isfile(filepath):
-                        break
-                else:
-                    continue
-            if os.path.isfile(filepath):
-                try:
-                    tz = tzfile(filepath)
-                    break
-                except (IOError, OSError, ValueError):
-                    pass
-        else:
-            tz = tzlocal()
-    else:
-        if name.startswith(":"):
-            name = name[:-1]
-        if os.path.isabs(name):
-            if os.path.isfile(name):
-                tz = tzfile(name)
-            else:
-                tz = None
-        else:
-            for path in TZPATHS:
-                filepath = os.path.join(path, name)
-                if not os.path.isfile(filepath):
-                    filepath = filepath.replace(' ', '_')
-                    if not os.path.isfile(filepath):
-                        continue
+def __get_gettz():
+    tzlocal_classes = (tzlocal,)
+    if tzwinlocal is not None:
+        tzlocal_classes += (tzwinlocal,)
+
+    class GettzFunc(object):
+        """
+        Retrieve a time zone object from a string representation
+
+        Time zones are cached per name: the most recently used ones are kept
+        with strong references, the others only as long as they are
+        referenced elsewhere (weak references). Names which don't resolve to
+        a time zone are cached too. Local time zones, which depend on the
+        environment, are never cached.
+
+        Use :func:`gettz.nocache` to get a fresh instance, and
+        :func:`gettz.cache_clear` to drop all cached ones.
+        """
+        def __init__(self):
+            self.__instances = weakref.WeakValueDictionary()
+            self.__strong_cache_size = 8
+            self.__strong_cache = OrderedDict()
+            self.__misses_size = 256
+            self.__misses = OrderedDict()
+            self._cache_lock = _thread.allocate_lock()
+
+        def __call__(self, name=None):
+            with self._cache_lock:
+                rv = self.__instances.get(name, None)
+
+                if rv is None:
+                    if name and name in self.__misses:
+                        return None
+
+                    rv = self.nocache(name=name)
+                    if rv is None:
+                        if name:
+                            self.__misses[name] = None
+                            if len(self.__misses) > self.__misses_size:
+                                self.__misses.popitem(last=False)
+                        return rv
+
+                    if not name or isinstance(rv, tzlocal_classes):
+                        # tzlocal depends on the environment at construction
+                        # time, so don't cache that.
+                        return rv
+
+                    self.__instances[name] = rv
+
+                self.__strong_cache[name] = self.__strong_cache.pop(name, rv)
+
+                if len(self.__strong_cache) > self.__strong_cache_size:
+                    self.__strong_cache.popitem(last=False)
+
+            return rv
+
+        def set_cache_size(self, size):
+            """ Set number of time zones kept with strong references """
+            with self._cache_lock:
+                self.__strong_cache_size = size
+                while len(self.__strong_cache) > size:
+                    self.__strong_cache.popitem(last=False)
+
+        def cache_clear(self):
+            """ Drop all cached time zones and unresolved names """
+            with self._cache_lock:
+                self.__instances = weakref.WeakValueDictionary()
+                self.__strong_cache.clear()
+                self.__misses.clear()
+
+        @staticmethod
+        def nocache(name=None):
+            """A non-cached version of gettz"""
+            tz = None
+            if not name:
                 try:
-                    tz = tzfile(filepath)
-                    break
-                except (IOError, OSError, ValueError):
+                    name = os.environ["TZ"]
+                except KeyError:
                     pass
+            if name is None or name == ":":
+                for filepath in TZFILES:
+                    if not os.path.isabs(filepath):
+                        filename = filepath
+                        for path in TZPATHS:
+                            filepath = os.path.join(path, filename)
+                            if os.path.isfile(filepath):
+                                break
+                        else:
+                            continue
+                    if os.path.isfile(filepath):
+                        try:
+                            tz = tzfile(filepath)
+                            break
+                        except (IOError, OSError, ValueError):
+                            pass
+                else:
+                    tz = tzlocal()
             else:
-                tz = None
-                if tzwin is not None:
-                    try:
-                        tz = tzwin(name)
-                    except WindowsError:
+                if name.startswith(":"):
+                    name = name[:-1]
+                if os.path.isabs(name):
+                    if os.path.isfile(name):
+                        tz = tzfile(name)
+                    else:
                         tz = None
-
-                if not tz:
-                    from dateutil.zoneinfo import get_zonefile_instance
-                    tz = get_zonefile_instance().get(name)
-
-                if not tz:
-                    for c in name:
-                        # name must have at least one offset to be a tzstr
-                        if c in "0123456789":
-                            try:
-                                tz = tzstr(name)
-                            except ValueError:
-                                pass
+                else:
+                    for path in TZPATHS:
+                        filepath = os.path.join(path, name)
+                        if not os.path.isfile(filepath):
+                            filepath = filepath.replace(' ', '_')
+                            if not os.path.isfile(filepath):
+                                continue
+                        try:
+                            tz = tzfile(filepath)
                             break
+                        except (IOError, OSError, ValueError):
+                            pass
                     else:
-                        if name in ("GMT", "UTC"):
-                            tz = tzutc()
-                        elif name in time.tzname:
-                            tz = tzlocal()
-    return tz
+                        tz = None
+                        if tzwin is not None:
+                            try:
+                                tz = tzwin(name)
+                            except WindowsError:
+                                tz = None
+
+                        if not tz:
+                            from dateutil.zoneinfo import get_zonefile_instance
+                            tz = get_zonefile_instance().get(name)
+
+                        if not tz:
+                            for c in name:
+                                # name must have at least one offset to be
+                                # a tzstr
+                                if c in "0123456789":
+                                    try:
+                                        tz = tzstr(name)
+                                    except ValueError:
+                                        pass
+                                    break
+                            else:
+                                if name in ("GMT", "UTC"):
+                                    tz = tzutc()
+                                elif name in time.tzname:
+                                    tz = tzlocal()
+            return tz
+
+    return GettzFunc()
+
+gettz = __get_gettz()
+del __get_gettz
 
 
 def datetime_exists(dt, tz=None):
@@ -1440,6 +1684,13 @@ def datetime_ambiguous(dt, tz=None):
     return not (same_offset and same_dst)
 
 
+def _timestamp_to_datetime(timestamp):
+    """
+    Convert a timestamp to a naive datetime.
+    """
+    return EPOCH + datetime.timedelta(seconds=timestamp)
+
+
 def _datetime_to_timestamp(dt):
     """
     Convert a :class:`datetime.datetime` object to an epoch timestamp in seconds
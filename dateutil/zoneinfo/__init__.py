@@ -5,19 +5,35 @@ import warnings
 import tempfile
 import shutil
 import json
+import zlib
+import bz2
+import mmap
+import struct
 
 from tarfile import TarFile
 from pkgutil import get_data
 from io import BytesIO
 from contextlib import closing
 
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
 from dateutil.tz import tzfile
 
 __all__ = ["get_zonefile_instance", "gettz", "gettz_db_metadata", "rebuild"]
 
 ZONEFILENAME = "dateutil-zoneinfo.tar.gz"
+ZONEBUNDLENAME = "dateutil-zoneinfo.bundle"
 METADATA_FN = 'METADATA'
 
+# Uncompressed zoneinfo bundle: magic, number of entries, then for every
+# entry its name length, name (UTF-8), offset and length of its TZif data.
+# All numbers are big-endian. Links follow all the other entries and share
+# the offset of their target.
+BUNDLE_MAGIC = b'TZB1'
+
 # python2.6 compatability. Note that TarFile.__exit__ != TarFile.close, but
 # it's close enough for python2.6
 tar_open = TarFile.open
@@ -32,6 +48,9 @@ class tzfile(tzfile):
 
 
 def getzoneinfofile_stream():
+    bundle = os.path.join(os.path.dirname(__file__), ZONEBUNDLENAME)
+    if os.path.isfile(bundle):
+        return open(bundle, 'rb')
     try:
         return BytesIO(get_data(__name__, ZONEFILENAME))
     except IOError as e:  # TODO  switch to FileNotFoundError?
@@ -39,9 +58,140 @@ def getzoneinfofile_stream():
         return None
 
 
+class _BufferReader(object):
+    """
+    File-like reader of a ``length`` bytes long part of ``data`` (bytes,
+    :class:`mmap.mmap` or :class:`memoryview`) starting at ``offset``. Only
+    the requested pieces are copied.
+    """
+    def __init__(self, data, offset, length):
+        self._data = data
+        self._pos = offset
+        self._end = offset + length
+
+    def read(self, size=-1):
+        start = self._pos
+        if size < 0:
+            self._pos = self._end
+        else:
+            self._pos = min(self._end, start + size)
+        return _buffer_bytes(self._data[start:self._pos])
+
+
+def _buffer_view(data):
+    # mmap does not support memoryview on python2, slicing it works anyway
+    try:
+        return memoryview(data)
+    except TypeError:
+        return data
+
+
+def _buffer_bytes(chunk):
+    if isinstance(chunk, memoryview):
+        return chunk.tobytes()
+    return chunk
+
+
+class _LazyZones(Mapping):
+    """
+    Read-only mapping of zone names to :class:`tzfile` objects, which parses
+    every zone from the uncompressed tarball or bundle data on first access.
+    """
+    def __init__(self, data, members, links):
+        self._data = data
+        self._members = members
+        self._links = links
+        self._zones = {}
+
+    def __getitem__(self, name):
+        try:
+            return self._zones[name]
+        except KeyError:
+            pass
+
+        if name in self._links:
+            # links point to their parent object, as in the eager mode
+            zone = self[self._links[name]]
+        elif name in self._members:
+            offset, size = self._members[name]
+            zone = tzfile(_BufferReader(self._data, offset, size),
+                          filename=name)
+        else:
+            raise KeyError(name)
+
+        return self._zones.setdefault(name, zone)
+
+    def __iter__(self):
+        for name in self._members:
+            yield name
+        for name in self._links:
+            yield name
+
+    def __len__(self):
+        return len(self._members) + len(self._links)
+
+
+def _read_tar_data(zonefile_stream):
+    """ Returns uncompressed content of the tarball stream """
+    data = zonefile_stream.read()
+    if data[:2] == b'\x1f\x8b':
+        return zlib.decompress(data, 16 + zlib.MAX_WBITS)
+    if data[:3] == b'BZh':
+        return bz2.decompress(data)
+    return data
+
+
+def _seekable_stream(zonefile_stream):
+    """ Returns the stream, read into memory if it is not seekable """
+    try:
+        zonefile_stream.seek(zonefile_stream.tell())
+    except (AttributeError, IOError, OSError, ValueError):
+        # i.e. a pipe or a socket file
+        return BytesIO(zonefile_stream.read())
+    return zonefile_stream
+
+
+def _is_bundle(zonefile_stream):
+    pos = zonefile_stream.tell()
+    magic = zonefile_stream.read(len(BUNDLE_MAGIC))
+    zonefile_stream.seek(pos)
+    return magic == BUNDLE_MAGIC
+
+
+def _zonefile_instance(**kwargs):
+    """ ZoneInfoFile of the data provided by the ``dateutil`` package """
+    zonefile_stream = getzoneinfofile_stream()
+    if zonefile_stream is None:
+        return ZoneInfoFile(None, **kwargs)
+    # the bundle stays memory-mapped without its file
+    with closing(zonefile_stream):
+        return ZoneInfoFile(zonefile_stream, **kwargs)
+
+
 class ZoneInfoFile(object):
-    def __init__(self, zonefile_stream=None):
+    def __init__(self, zonefile_stream=None, lazy=False):
+        """
+        :param zonefile_stream:
+            A stream of the zoneinfo tarball.
+
+        :param lazy:
+            If ``True``, the tarball is only indexed up front and every zone
+            is parsed on its first lookup. ``zones`` is then a read-only
+            mapping instead of a :class:`dict`.
+
+        Streams of the uncompressed bundle (see :func:`rebuild`) are always
+        read lazily. A bundle opened from a file is memory-mapped, so
+        processes using the same file share its pages, and the file may be
+        closed once the instance is created. Streams that can not seek are
+        read into memory first.
+        """
         if zonefile_stream is not None:
+            zonefile_stream = _seekable_stream(zonefile_stream)
+        if zonefile_stream is not None and _is_bundle(zonefile_stream):
+            self._init_bundle(zonefile_stream)
+        elif zonefile_stream is not None and lazy:
+            self._init_lazy(zonefile_stream)
+        elif zonefile_stream is not None:
             with tar_open(fileobj=zonefile_stream, mode='r') as tf:
                 # dict comprehension does not work on python2.6
                 # TODO: get back to the nicer syntax when we ditch python2.6
@@ -71,6 +221,61 @@ class ZoneInfoFile(object):
             self.zones = dict()
             self.metadata = None
 
+    def _init_lazy(self, zonefile_stream):
+        data = _read_tar_data(zonefile_stream)
+        with tar_open(fileobj=BytesIO(data), mode='r') as tf:
+            members = dict((zf.name, (zf.offset_data, zf.size))
+                           for zf in tf.getmembers()
+                           if zf.isfile() and zf.name != METADATA_FN)
+            links = dict((zl.name, zl.linkname)
+                         for zl in tf.getmembers() if
+                         zl.islnk() or zl.issym())
+            try:
+                metadata_json = tf.extractfile(tf.getmember(METADATA_FN))
+                metadata_str = metadata_json.read().decode('UTF-8')
+                self.metadata = json.loads(metadata_str)
+            except KeyError:
+                # no metadata in tar file
+                self.metadata = None
+        self.zones = _LazyZones(data, members, links)
+
+    def _init_bundle(self, zonefile_stream):
+        try:
+            data = mmap.mmap(zonefile_stream.fileno(), 0,
+                             access=mmap.ACCESS_READ)
+        except (AttributeError, IOError, OSError, ValueError):
+            # not a real file, i.e. BytesIO
+            data = zonefile_stream.read()
+        data = _buffer_view(data)
+
+        count, = struct.unpack(">I", _buffer_bytes(data[4:8]))
+        pos = 8
+        members = {}
+        links = {}
+        targets = {}
+        self.metadata = None
+        for i in range(count):
+            namelen, = struct.unpack(">H", _buffer_bytes(data[pos:pos + 2]))
+            pos += 2
+            name = _buffer_bytes(data[pos:pos + namelen])
+            if not isinstance(name, str):
+                # python3, names are str as in the tarball
+                name = name.decode('UTF-8')
+            pos += namelen
+            offset, size = struct.unpack(">II",
+                                         _buffer_bytes(data[pos:pos + 8]))
+            pos += 8
+            if name == METADATA_FN:
+                metadata_str = _buffer_bytes(
+                    data[offset:offset + size]).decode('UTF-8')
+                self.metadata = json.loads(metadata_str)
+            elif offset in targets:
+                links[name] = targets[offset]
+            else:
+                targets[offset] = name
+                members[name] = (offset, size)
+        self.zones = _LazyZones(data, members, links)
+
     def get(self, name, default=None):
         """
         Wrapper for :func:`ZoneInfoFile.zones.get`. This is a convenience method
@@ -100,7 +305,9 @@ def get_zonefile_instance(new_instance=False):
     """
     This is a convenience function which provides a :class:`ZoneInfoFile`
     instance using the data provided by the ``dateutil`` package. By default, it
-    caches a single instance of the ZoneInfoFile object and returns that.
+    caches a single instance of the ZoneInfoFile object and returns that. The
+    instance is created in the lazy mode, so only the zones actually used are
+    parsed.
 
     :param new_instance:
         If ``True``, a new instance of :class:`ZoneInfoFile` is instantiated and
@@ -118,7 +325,7 @@ def get_zonefile_instance(new_instance=False):
         zif = getattr(get_zonefile_instance, '_cached_instance', None)
 
     if zif is None:
-        zif = ZoneInfoFile(getzoneinfofile_stream())
+        zif = _zonefile_instance(lazy=True)
 
         get_zonefile_instance._cached_instance = zif
 
@@ -158,7 +365,7 @@ def gettz(name):
                   DeprecationWarning)
 
     if len(_CLASS_ZONE_INSTANCE) == 0:
-        _CLASS_ZONE_INSTANCE.append(ZoneInfoFile(getzoneinfofile_stream()))
+        _CLASS_ZONE_INSTANCE.append(_zonefile_instance())
     return _CLASS_ZONE_INSTANCE[0].zones.get(name)
 
 
@@ -181,7 +388,7 @@ def gettz_db_metadata():
                   DeprecationWarning)
 
     if len(_CLASS_ZONE_INSTANCE) == 0:
-        _CLASS_ZONE_INSTANCE.append(ZoneInfoFile(getzoneinfofile_stream()))
+        _CLASS_ZONE_INSTANCE.append(_zonefile_instance())
     return _CLASS_ZONE_INSTANCE[0].metadata
 
 
@@ -3,9 +3,11 @@ import os
 import tempfile
 import shutil
 import json
+import struct
 from subprocess import check_call
 
-from dateutil.zoneinfo import tar_open, METADATA_FN, ZONEFILENAME
+from dateutil.zoneinfo import (tar_open, METADATA_FN, ZONEFILENAME,
+                               ZONEBUNDLENAME, BUNDLE_MAGIC)
 
 
 def rebuild(filename, tag=None, format="gz", zonegroups=[], metadata=None):
@@ -13,6 +15,10 @@ def rebuild(filename, tag=None, format="gz", zonegroups=[], metadata=None):
 
     filename is the timezone tarball from ftp.iana.org/tz.
 
+    With format="bundle" the uncompressed, indexed
+    dateutil/zoneinfo/dateutil-zoneinfo.bundle is written instead of the
+    tarball. It is preferred over the tarball when present.
+
     """
     tmpdir = tempfile.mkdtemp()
     zonedir = os.path.join(tmpdir, "zoneinfo")
@@ -30,14 +36,97 @@ def rebuild(filename, tag=None, format="gz", zonegroups=[], metadata=None):
         # write metadata file
         with open(os.path.join(zonedir, METADATA_FN), 'w') as f:
             json.dump(metadata, f, indent=4, sort_keys=True)
-        target = os.path.join(moduledir, ZONEFILENAME)
-        with tar_open(target, "w:%s" % format) as tf:
-            for entry in os.listdir(zonedir):
-                entrypath = os.path.join(zonedir, entry)
-                tf.add(entrypath, entry)
+        if format == "bundle":
+            entries = []
+            links = []
+            # zic writes links as hard links (or symlinks), the first path
+            # of a file is its name, as in the tarball
+            inodes = {}
+            for dirpath, dirnames, filenames in os.walk(zonedir):
+                dirnames.sort()
+                for fn in sorted(filenames):
+                    path = os.path.join(dirpath, fn)
+                    name = _bundle_name(path, zonedir)
+                    if os.path.islink(path):
+                        links.append((name, _bundle_name(
+                            os.path.realpath(path), zonedir)))
+                        continue
+                    st = os.stat(path)
+                    inode = (st.st_dev, st.st_ino)
+                    if inode in inodes:
+                        links.append((name, inodes[inode]))
+                        continue
+                    inodes[inode] = name
+                    with open(path, 'rb') as f:
+                        entries.append((name, f.read()))
+            write_bundle(entries, os.path.join(moduledir, ZONEBUNDLENAME),
+                         links)
+        else:
+            target = os.path.join(moduledir, ZONEFILENAME)
+            with tar_open(target, "w:%s" % format) as tf:
+                for entry in os.listdir(zonedir):
+                    entrypath = os.path.join(zonedir, entry)
+                    tf.add(entrypath, entry)
     finally:
         shutil.rmtree(tmpdir)
 
+def bundle_from_tarball(filename=None, target=None):
+    """Convert zoneinfo tarball into the uncompressed bundle
+
+    filename is the zoneinfo tarball, the one shipped with dateutil if None.
+    target is the bundle file, dateutil/zoneinfo/dateutil-zoneinfo.bundle if
+    None.
+
+    """
+    moduledir = os.path.dirname(__file__)
+    if filename is None:
+        filename = os.path.join(moduledir, ZONEFILENAME)
+    if target is None:
+        target = os.path.join(moduledir, ZONEBUNDLENAME)
+    entries = []
+    links = []
+    with tar_open(filename) as tf:
+        for member in tf.getmembers():
+            if member.isfile():
+                entries.append((member.name, tf.extractfile(member).read()))
+            elif member.islnk() or member.issym():
+                links.append((member.name, member.linkname))
+    write_bundle(entries, target, links)
+
+def write_bundle(entries, target, links=()):
+    """Write the uncompressed zoneinfo bundle
+
+    entries is a list of (name, data) pairs, every one stored on its own.
+    links is a list of (name, linkname) pairs of links to entries, which
+    share the data of their entry and follow all the entries in the index.
+
+    """
+    entries = sorted(entries)
+    links = sorted(links)
+    names = [name.encode('UTF-8') for name, data in entries]
+    link_names = [name.encode('UTF-8') for name, linkname in links]
+    offset = len(BUNDLE_MAGIC) + 4 + sum(2 + len(n) + 8
+                                         for n in names + link_names)
+    offsets = {}
+    blobs = []
+    index = []
+    for name, (key, data) in zip(names, entries):
+        offsets[key] = (offset, len(data))
+        blobs.append(data)
+        index.append(struct.pack(">H", len(name)) + name +
+                     struct.pack(">II", offset, len(data)))
+        offset += len(data)
+    for name, (_, linkname) in zip(link_names, links):
+        index.append(struct.pack(">H", len(name)) + name +
+                     struct.pack(">II", *offsets[linkname]))
+    with open(target, 'wb') as f:
+        f.write(BUNDLE_MAGIC + struct.pack(">I", len(index)))
+        f.write(b''.join(index))
+        f.write(b''.join(blobs))
+
+def _bundle_name(path, zonedir):
+    return os.path.relpath(path, zonedir).replace(os.sep, '/')
+
 def _print_on_nosuchfile(e):
     """Print helpful troubleshooting message
 
@@ -1,28 +1,374 @@
-from datetime import date, timedelta
-from dateutil import easter
-from dateutil.relativedelta import *
+import re, calendar, struct, sys
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+from collections import OrderedDict
+from dateutil import easter, rrule
+
+# fixed date holidays: name -> (month, day)
+FIXED_HOLIDAYS = (
+    ('New Year', (1, 1)),
+    ('Trzech Kroli', (1, 6)),
+    ('Labor Day', (5, 1)),
+    ('Constitution Day', (5, 3)),
+    ('Assumption of the Blessed Virgin Mary', (8, 15)),
+    ('All Saints\' Day', (11, 1)),
+    ('Independence Day', (11, 11)),
+    ('Christmas  Day', (12, 25)),
+    ('Boxing Day', (12, 26)),
+    )
+
+# movable holidays: name -> days after Easter Sunday
+EASTER_HOLIDAYS = (
+    ('Easter Sunday', 0),
+    ('Easter Monday', 1),
+    # 7th Sunday after Easter
+    ('Pentecost Sunday', 49),
+    # 9th Thursday after Easter
+    ('Corpus Christi', 60),
+    )
+
+# holiday rules spec: one rule per line (or separated by '|'), see HolidayRules
+RULES_SEP = re.compile(r"[\r\n|]+")
+FIXED_RULE = re.compile(r"^(\d{1,2})-(\d{1,2})$")
+EASTER_RULE = re.compile(r"^easter([+-]\d+)?$", re.I)
+NTH_WEEKDAY_RULE = re.compile(r"^(\d{1,2})/(MO|TU|WE|TH|FR|SA|SU)#([+-]?\d)$",
+                              re.I)
+RRULE_PREFIX = 'RRULE:'
+RRULE_DTSTART = re.compile(r"DTSTART=(\d{4})(\d{2})(\d{2});?", re.I)
+# start of RRULE rules without DTSTART: first year of Gregorian calendar
+RRULE_EPOCH = date(1583, 1, 1)
+WEEKDAYS = ('MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU')
+
+# max number of (rules, year) evaluations and of compiled rules kept
+CACHE_SIZE = 256
+_holidays_cache = OrderedDict()
+_rules_cache = OrderedDict()
+
+def rules_spec(fixed=FIXED_HOLIDAYS, movable=EASTER_HOLIDAYS):
+    """ Returns holiday rules spec of FIXED_HOLIDAYS and EASTER_HOLIDAYS
+    like tables """
+    lines = ['%02d-%02d %s' % (m, d, name) for name, (m, d) in fixed]
+    lines += ['easter%+d %s' % (offset, name) for name, offset in movable]
+    return '\n'.join(lines)
+
+# Polish holidays (legally considered non-working days)
+POLISH_HOLIDAYS = rules_spec()
+
+class HolidayRules(object):
+    """ Holidays defined by a declarative spec, evaluated per year.
+
+    The spec has one rule per line (or rules separated by '|'): a date rule
+    followed by the holiday name, i.e.
+
+        01-06 Trzech Kroli
+        easter+60 Corpus Christi
+        11/TH#4 Thanksgiving
+        RRULE:FREQ=YEARLY;BYMONTH=5;BYDAY=-1MO Memorial Day
+
+    Date rules are MM-DD (fixed date), easter[+-N] (N days after Easter
+    Sunday), MM/WD#N (N-th weekday WD of month MM, negative N counts from
+    the end of month) and RRULE:... (iCalendar yearly rule, evaluated with
+    dateutil.rrule). RRULE rules keep their INTERVAL, COUNT and UNTIL and
+    start on DTSTART=YYYYMMDD given among the rule parts (on RRULE_EPOCH by
+    default), i.e. RRULE:FREQ=YEARLY;INTERVAL=4;DTSTART=20200601 fires on
+    2020-06-01, 2024-06-01 etc. Empty lines and lines starting with '#' are
+    skipped.
+
+    Raises ValueError for invalid rules.
+    """
+    def __init__(self, spec):
+        self.spec = spec
+        # (month, day, name)
+        self.fixed = []
+        # (days after Easter Sunday, name)
+        self.movable = []
+        # (month, weekday, n, name)
+        self.nth_weekdays = []
+        # (date only rrule, name)
+        self.rrules = []
+        for line in RULES_SEP.split(spec):
+            line = line.strip()
+            if line and not line.startswith('#'):
+                parts = line.split(None, 1)
+                self.add_rule(parts[0], parts[-1])
+
+    def add_rule(self, rule, name):
+        """ Adds holiday name of date rule (see HolidayRules) """
+        m = FIXED_RULE.match(rule)
+        if m:
+            month, day = int(m.group(1)), int(m.group(2))
+            # 2000 is leap year, 02-29 is valid (and skipped in other years)
+            if (1 <= month <= 12 and
+                    1 <= day <= calendar.monthrange(2000, month)[1]):
+                self.fixed.append((month, day, name))
+                return
+        m = EASTER_RULE.match(rule)
+        if m:
+            self.movable.append((int(m.group(1) or 0), name))
+            return
+        m = NTH_WEEKDAY_RULE.match(rule)
+        if m:
+            month, n = int(m.group(1)), int(m.group(3))
+            if 1 <= month <= 12 and 1 <= abs(n) <= 5:
+                self.nth_weekdays.append(
+                    (month, WEEKDAYS.index(m.group(2).upper()), n, name))
+                return
+        if rule.upper().startswith(RRULE_PREFIX):
+            dtstart = RRULE_EPOCH
+            m = RRULE_DTSTART.search(rule)
+            if m:
+                dtstart = date(*map(int, m.groups()))
+                rule = (rule[:m.start()] + rule[m.end():]).rstrip(';')
+            # cached, as every year is looked up from dtstart
+            self.rrules.append(
+                (rrule.rrulestr(rule, dtstart=dtstart, cache=True)
+                 .replace(dateonly=True), name))
+            return
+        raise ValueError("Invalid holiday rule: %s" % rule)
+
+    def evaluate(self, year, easter_sunday=None):
+        """ Returns (ordinals, names) of the holidays of year, sorted by date
+
+        Results are cached per (spec, year). `easter_sunday` may be given
+        when already known.
+        """
+        key = (self.spec, year)
+        if key in _holidays_cache:
+            res = _holidays_cache.pop(key)
+        else:
+            res = self._evaluate(year, easter_sunday)
+            if len(_holidays_cache) >= CACHE_SIZE:
+                _holidays_cache.popitem(last=False)
+        _holidays_cache[key] = res
+        return res
+
+    def _evaluate(self, year, easter_sunday):
+        res = []
+        for month, day, name in self.fixed:
+            if day <= calendar.monthrange(year, month)[1]:
+                res.append((date(year, month, day).toordinal(), name))
+        if self.movable:
+            if easter_sunday is None:
+                easter_sunday = easter.easter(year)
+            e = easter_sunday.toordinal()
+            res.extend((e + offset, name) for offset, name in self.movable)
+        for month, wday, n, name in self.nth_weekdays:
+            first = date(year, month, 1).toordinal()
+            last = first + calendar.monthrange(year, month)[1] - 1
+            # weekday of ordinal o is (o + 6) % 7
+            if n > 0:
+                o = first + (n - 1)*7 + (wday - first - 6) % 7
+            else:
+                o = last + (n + 1)*7 - (last + 6 - wday) % 7
+            if first <= o <= last:
+                res.append((o, name))
+        for rule, name in self.rrules:
+            res.extend((dt.toordinal(), name) for dt in
+                       rule.between(date(year, 1, 1), date(year, 12, 31),
+                                    inc=True))
+        res.sort()
+        return tuple(o for o, name in res), tuple(name for o, name in res)
+
+    def ordinals(self, year):
+        """ Returns sorted day ordinals of the holidays of year """
+        return self.evaluate(year)[0]
+
+    def holidays(self, year):
+        """ Returns list of (date, holiday name) of year, sorted by date """
+        ordinals, names = self.evaluate(year)
+        return zip(map(date.fromordinal, ordinals), names)
+
+    def holidays_range(self, start_year, end_year):
+        """ Returns holidays of years start_year..end_year (inclusive)
+
+        Result is OrderedDict date -> list of holiday names, sorted by date.
+        """
+        years = range(start_year, end_year + 1)
+        easter_sundays = [None] * len(years)
+        if self.movable:
+            months, days = easter.easter_array(years)
+            easter_sundays = [date(year, int(m), int(d))
+                              for year, m, d in zip(years, months, days)]
+        res = OrderedDict()
+        for year, easter_sunday in zip(years, easter_sundays):
+            ordinals, names = self.evaluate(year, easter_sunday)
+            for o, name in zip(ordinals, names):
+                res.setdefault(date.fromordinal(o), []).append(name)
+        return res
+
+def compile_rules(spec):
+    """ Returns HolidayRules of spec, compiled once per spec """
+    if spec in _rules_cache:
+        rules = _rules_cache.pop(spec)
+    else:
+        rules = HolidayRules(spec)
+        if len(_rules_cache) >= CACHE_SIZE:
+            _rules_cache.popitem(last=False)
+    _rules_cache[spec] = rules
+    return rules
+
+def load_rules(fname):
+    """ Returns HolidayRules of spec read from file fname """
+    f = open(fname)
+    try:
+        return compile_rules(f.read())
+    finally:
+        f.close()
+
+class SpecialDates(object):
+    """ Sorted store of special days (i.e. birthdays) with descriptions.
+
+    Days are kept in date order as month * 100 + day keys in an array, the
+    descriptions in a parallel list, where equal descriptions share one
+    string. Days of the same date keep the order they were added in.
+    Lookups by date and by month use bisect.
+
+    Stores can be saved with dump and read back with load; the file has
+    HEADER (MAGIC, VERSION, counts and descriptions size), little-endian key
+    and description index arrays and the distinct descriptions separated by
+    NUL characters.
+    """
+    MAGIC = 'PLSD'
+    HEADER = struct.Struct('<4sHIII')
+    VERSION = 1
+
+    def __init__(self, items=()):
+        """ :items: (date, description) pairs, dates may be of any year """
+        self.keys = array('H')
+        self.descriptions = []
+        self._strings = {}
+        self.extend(items)
+
+    def _intern(self, description):
+        return self._strings.setdefault(description, description)
+
+    def extend(self, items):
+        """ Adds (date, description) pairs """
+        self._merge([(dt.month * 100 + dt.day, description)
+                     for dt, description in items])
+
+    def update(self, other):
+        """ Adds special days of other store """
+        self._merge(zip(other.keys, other.descriptions))
+
+    def _merge(self, items):
+        items = [(key, self._intern(description))
+                 for key, description in items]
+        if self.keys:
+            items[:0] = zip(self.keys, self.descriptions)
+        items.sort(key=lambda item: item[0])
+        self.keys = array('H', [key for key, description in items])
+        self.descriptions = [description for key, description in items]
+
+    def add(self, dt, description=''):
+        """ Adds single special day """
+        key = dt.month * 100 + dt.day
+        i = bisect_right(self.keys, key)
+        self.keys.insert(i, key)
+        self.descriptions.insert(i, self._intern(description))
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __iter__(self):
+        """ Yields (month, day, description) in date order """
+        for key, description in zip(self.keys, self.descriptions):
+            yield key // 100, key % 100, description
+
+    def days(self):
+        """ Yields (month, day, descriptions) of every distinct date """
+        keys = self.keys
+        lo = 0
+        while lo < len(keys):
+            key = keys[lo]
+            hi = bisect_right(keys, key, lo)
+            yield key // 100, key % 100, self.descriptions[lo:hi]
+            lo = hi
+
+    def __contains__(self, dt):
+        key = dt.month * 100 + dt.day
+        i = bisect_left(self.keys, key)
+        return i < len(self.keys) and self.keys[i] == key
+
+    def get(self, dt):
+        """ Returns list of descriptions of the special days of dt's date """
+        key = dt.month * 100 + dt.day
+        return self.descriptions[bisect_left(self.keys, key):
+                                 bisect_right(self.keys, key)]
+
+    def month(self, month):
+        """ Returns list of (day, description) of month, in date order """
+        lo = bisect_left(self.keys, month * 100)
+        hi = bisect_left(self.keys, month * 100 + 100)
+        return [(key % 100, description) for key, description in
+                zip(self.keys[lo:hi], self.descriptions[lo:hi])]
+
+    def dump(self, f):
+        """ Writes the store to binary file object f """
+        strings = []
+        index = {}
+        indexes = array('I')
+        for description in self.descriptions:
+            if description not in index:
+                index[description] = len(strings)
+                strings.append(description)
+            indexes.append(index[description])
+        keys = array('H', self.keys)
+        if sys.byteorder == 'big':
+            keys.byteswap()
+            indexes.byteswap()
+        strings = '\0'.join(s.encode('utf-8') if isinstance(s, unicode) else s
+                             for s in strings)
+        f.write(self.HEADER.pack(self.MAGIC, self.VERSION, len(keys),
+                                 len(index), len(strings)))
+        f.write(keys.tostring())
+        f.write(indexes.tostring())
+        f.write(strings)
+
+    @classmethod
+    def load(cls, f):
+        """ Returns store read from binary file object f (see dump)
+
+        Raises ValueError if f is not a special days file.
+        """
+        header = f.read(cls.HEADER.size)
+        if len(header) < cls.HEADER.size:
+            raise ValueError("Not a special days file")
+        magic, version, count, nstrings, size = cls.HEADER.unpack(header)
+        if magic != cls.MAGIC or version != cls.VERSION:
+            raise ValueError("Not a special days file")
+        keys = array('H')
+        keys.fromstring(f.read(count * keys.itemsize))
+        indexes = array('I')
+        indexes.fromstring(f.read(count * indexes.itemsize))
+        if sys.byteorder == 'big':
+            keys.byteswap()
+            indexes.byteswap()
+        strings = f.read(size)
+        if len(strings) != size:
+            raise ValueError("Corrupted special days file")
+        strings = strings.split('\0') if nstrings else []
+        if (len(keys) != count or len(indexes) != count or
+                len(strings) != nstrings or
+                (indexes and max(indexes) >= nstrings)):
+            raise ValueError("Corrupted special days file")
+        res = cls()
+        res.keys = keys
+        res.descriptions = [res._intern(strings[i]) for i in indexes]
+        return res
 
 def get_holidays(year=2010):
     """ Returns Polish hollidays dates (legally considered non-working days) """
-    easter_sunday = easter.easter(year)
-    holidays = {'New Year': date(year,1,1),
-                'Trzech Kroli': date(year,1,6),
-                'Easter Sunday': easter_sunday,
-                'Easter Monday': easter_sunday + timedelta(days=1),
-                'Labor Day': date(year,5,1),
-                'Constitution Day': date(year,5,3),
-                # 7th Sunday after Easter
-                # (notice days+1 - this is 7th Sunday excluding Easter Sunday
-                'Pentecost Sunday': easter_sunday + relativedelta(days=+1, weekday=SU(+7)),
-                # 9th Thursday after Easter
-                'Corpus Christi': easter_sunday + relativedelta(weekday=TH(+9)),
-                'Assumption of the Blessed Virgin Mary': date(year,8,15),
-                'All Saints\' Day': date(year,11,1),
-                'Independence Day': date(year,11,11),
-                'Christmas  Day': date(year, 12, 25),
-                'Boxing Day': date(year, 12, 26),
-                }
-    return holidays
+    return dict((name, dt)
+                for dt, name in compile_rules(POLISH_HOLIDAYS).holidays(year))
+
+def get_holidays_range(start_year, end_year):
+    """ Returns Polish holidays of years start_year..end_year (inclusive)
+
+    Result is OrderedDict date -> list of holiday names, sorted by date.
+    """
+    return compile_rules(POLISH_HOLIDAYS).holidays_range(start_year, end_year)
 
 if __name__ == "__main__":
-    print get(2010)
+    print get_holidays(2010)
@@ -65,9 +65,10 @@ class BasicDayMaker(object):
         self.week_y += 1
 
     def write_month_header(self, svg_calendar, g, month):
-        txt_atts = {'style': simplestyle.formatStyle(svg_calendar.style_month),
+        txt_atts = svg_calendar.styles.attribs(svg_calendar.style_month)
+        txt_atts.update({
                     'x': str( (svg_calendar.month_w - svg_calendar.day_w) / 2 ),
-                    'y': str( svg_calendar.day_h / 5 ) }
+                    'y': str( svg_calendar.day_h / 5 ) })
         week_x = 0
         try:
           inkex.etree.SubElement(g, 'text', txt_atts).text = unicode(svg_calendar.options.month_names[month-1], svg_calendar.options.input_encode)
@@ -77,9 +78,10 @@ class BasicDayMaker(object):
         gw = inkex.etree.SubElement(g, 'g')
         if svg_calendar.options.start_day=='sun':
           for wday in svg_calendar.options.day_names:
-            txt_atts = {'style': simplestyle.formatStyle(svg_calendar.style_day_name),
+            txt_atts = svg_calendar.styles.attribs(svg_calendar.style_day_name)
+            txt_atts.update({
                         'x': str( svg_calendar.day_w * week_x ),
-                        'y': str( svg_calendar.day_h ) }
+                        'y': str( svg_calendar.day_h ) })
             try:
               inkex.etree.SubElement(gw, 'text', txt_atts).text = unicode(wday, svg_calendar.options.input_encode)
             except:
@@ -90,9 +92,10 @@ class BasicDayMaker(object):
           w2 = svg_calendar.options.day_names[1:]
           w2.append(svg_calendar.options.day_names[0])
           for wday in w2:
-            txt_atts = {'style': simplestyle.formatStyle(svg_calendar.style_day_name),
+            txt_atts = svg_calendar.styles.attribs(svg_calendar.style_day_name)
+            txt_atts.update({
                         'x': str( svg_calendar.day_w * week_x ),
-                        'y': str( svg_calendar.day_h ) }
+                        'y': str( svg_calendar.day_h ) })
             try:
               inkex.etree.SubElement(gw, 'text', txt_atts).text = unicode(wday, svg_calendar.options.input_encode)
             except:
@@ -114,6 +117,7 @@ class BasicDayMaker(object):
         other_holidays = kwargs['other_holidays'] if 'other_holidays' in kwargs else None
         self._off_y = 0
         new_style = day_style.copy()
+        style_name = svg_calendar.styles.name_of(day_style)
 
         def get_txt_atts(text_align="", font_size=""):
             if text_align:
@@ -121,9 +125,10 @@ class BasicDayMaker(object):
                 new_style['text-anchor'] = text_align
             if font_size:
                 new_style['font-size'] = font_size
-            txt_atts = {'style': simplestyle.formatStyle(new_style),
+            txt_atts = svg_calendar.styles.attribs(new_style, style_name)
+            txt_atts.update({
                         'x': str( svg_calendar.day_w * self.week_x + svg_calendar._day_offset_x ),
-                        'y': str( svg_calendar.day_h * (self.week_y+2) + svg_calendar._day_offset_y+self._off_y) }
+                        'y': str( svg_calendar.day_h * (self.week_y+2) + svg_calendar._day_offset_y+self._off_y) })
             self._off_y += (int(font_size) if font_size else int(svg_calendar.day_w / 7) ) + 2
             return txt_atts
         txt_atts = get_txt_atts("left")    
@@ -156,15 +161,78 @@ class BasicDayMaker(object):
           self.before = False
           self.day_of_month += 1
         if svg_calendar.options.frame_enabled and other_holidays:
-            txt_atts['style']
-            for oh in other_holidays:
-                if oh['description']:
-                    inkex.etree.SubElement(day_group, 'tspan', get_txt_atts('left', other_holi_h)).text = str(oh['description'])
+            for description in other_holidays:
+                if description:
+                    inkex.etree.SubElement(day_group, 'tspan', get_txt_atts('left', other_holi_h)).text = str(description)
         self.week_x += 1
 
 
 
 
+class StyleRegistry(object):
+
+    """Formats every distinct style only once.
+
+    With use_classes enabled elements get `class` attribute instead of
+    inline `style`, and all used classes are returned by css().
+    """
+
+    def __init__(self, use_classes=False, formatted=None):
+        """
+        :use_classes: use CSS classes instead of inline styles
+        :formatted: dict style key -> formatted style, may be shared
+                    between registries
+
+        """
+        self.use_classes = use_classes
+        self.formatted = {} if formatted is None else formatted
+        self.names = {}
+        self.classes = {}
+        self.class_order = []
+
+    def key(self, style):
+        return tuple(sorted(style.items()))
+
+    def register(self, name, style):
+        """Registers CSS class name base for style"""
+        self.names[self.key(style)] = name
+
+    def name_of(self, style):
+        """Returns registered name of style or None"""
+        return self.names.get(self.key(style))
+
+    def attribs(self, style, name=None):
+        """Returns element attributes applying style
+
+        :style: style dict
+        :name: CSS class name base, registered name of style if None
+
+        """
+        key = self.key(style)
+        if key not in self.formatted:
+            self.formatted[key] = simplestyle.formatStyle(style)
+        if self.use_classes:
+            if name is None:
+                name = self.names.get(key)
+            if name:
+                if key not in self.classes:
+                    cls = name
+                    n = 1
+                    while cls in self.class_order:
+                        n += 1
+                        cls = '%s-%d' % (name, n)
+                    self.classes[key] = cls
+                    self.class_order.append(cls)
+                return {'class': self.classes[key]}
+        return {'style': self.formatted[key]}
+
+    def css(self):
+        """Returns style sheet of all used classes"""
+        by_class = dict((c, k) for k, c in self.classes.items())
+        return "\n".join(['.%s{%s}' % (c, self.formatted[by_class[c]])
+                          for c in self.class_order])
+
+
 class DayMakersFactory(object):
 
     """Factory of calendar day makers object"""
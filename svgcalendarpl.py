@@ -24,11 +24,51 @@ Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
 
 __version__ = "1.0"
 
-import inkex, simplestyle, re, calendar
+import inkex, simplestyle, re, calendar, copy, sys, multiprocessing
+from collections import OrderedDict
 from datetime import *
-from plcalendar import get_holidays
+from array import array
+from plcalendar import CACHE_SIZE, POLISH_HOLIDAYS, SpecialDates, compile_rules
 from dateutil import parser
-from svgcalendardays import DayMakersFactory
+from svgcalendardays import DayMakersFactory, StyleRegistry
+
+# day classification flags, stored in SVGCalendar.day_flags
+DAY_HOLIDAY = 1
+DAY_OTHER_HOLIDAY = 2
+
+# --other-holidays separators
+OTHER_HOLIDAYS_SEP = re.compile("[;,\r\n]+")
+DESCRIPTION_SEP = re.compile("[ \t]+")
+
+# date formats parsed without dateutil.parser: (regex, month group, day group)
+FAST_DATE_FORMATS = (
+    # YYYY-MM-DD
+    (re.compile(r"^\d{4}-(\d{1,2})-(\d{1,2})$"), 1, 2),
+    # MM-DD
+    (re.compile(r"^(\d{1,2})-(\d{1,2})$"), 1, 2),
+    # DD.MM and DD.MM.YYYY
+    (re.compile(r"^(\d{1,2})\.(\d{1,2})(?:\.\d{4})?$"), 2, 1),
+    )
+
+def parse_fast_date(text, year):
+    """ Returns date of `year` for text in one of FAST_DATE_FORMATS,
+    None if text has other format.
+
+    Raises ValueError if month and day do not make a date in `year`.
+    """
+    for regex, month_group, day_group in FAST_DATE_FORMATS:
+        m = regex.match(text)
+        if m:
+            return date(year, int(m.group(month_group)),
+                        int(m.group(day_group)))
+    return None
+
+# attributes set by SVGCalendar.calculate_size_and_positions
+LAYOUT_ATTRS = ('doc_w', 'doc_h', 'months_per_line', 'month_w', 'month_margin',
+                'day_w', 'day_h', 'month_h', 'year_margin',
+                'style_day', 'style_day_name', 'style_nmd', 'style_weekend',
+                'style_month', 'style_year', 'style_other_holiday',
+                '_day_offset_x', '_day_offset_y', '_formatted_styles')
 
 class SVGCalendar (inkex.Effect):
 
@@ -130,6 +170,31 @@ class SVGCalendar (inkex.Effect):
             dest="other_holidays", default="",
             help="List of dates of custom holidays special days"
                 )
+        self.OptionParser.add_option("--other-holidays-file",
+            action="store", type="string",
+            dest="other_holidays_file", default="",
+            help="File with more custom holidays special days, in --other-holidays format or saved with plcalendar.SpecialDates.dump"
+                )
+        self.OptionParser.add_option("--report-date-parsing",
+            action="store", type="inkbool",
+            dest="report_date_parsing", default=False,
+            help="Report how many --other-holidays dates needed the general date parser"
+                )
+        self.OptionParser.add_option("--default-holidays",
+            action="store", type="inkbool",
+            dest="default_holidays", default=True,
+            help="Include Polish holidays"
+                )
+        self.OptionParser.add_option("--holiday-rules",
+            action="store", type="string",
+            dest="holiday_rules", default="",
+            help="Additional holiday rules separated by '|' (see plcalendar.HolidayRules)"
+                )
+        self.OptionParser.add_option("--holiday-rules-file",
+            action="store", type="string",
+            dest="holiday_rules_file", default="",
+            help="File with additional holiday rules, one per line"
+                )
         self.OptionParser.add_option("--frame-enabled",
             action="store", type="inkbool", 
             dest="frame_enabled", default="False",
@@ -145,7 +210,15 @@ class SVGCalendar (inkex.Effect):
             dest="frame_fill", default="",
             help="Fill of frame"
                 )
-
+        self.OptionParser.add_option("--css-classes",
+            action="store", type="inkbool",
+            dest="css_classes", default=False,
+            help="Use CSS classes from single style element instead of inline styles"
+                )
+        # caches reused by render_batch between jobs, other holidays keep
+        # last CACHE_SIZE stores
+        self._other_holidays_cache = OrderedDict()
+        self._layout_cache = {}
 
 
     def validate_options(self):
@@ -180,25 +253,83 @@ class SVGCalendar (inkex.Effect):
         self.options.month_width  = inkex.unittouu( self.options.month_width )
         self.options.month_margin = inkex.unittouu( self.options.month_margin )
 
+        self.holiday_rules = self.get_holiday_rules()
+
+        key = (self.options.other_holidays, self.options.other_holidays_file,
+               int(self.options.year))
+        cache = self._other_holidays_cache
+        if key in cache:
+            self.other_holidays = cache.pop(key)
+        else:
+            self.other_holidays = self.load_other_holidays(*key)
+            if len(cache) >= CACHE_SIZE:
+                cache.popitem(last=False)
+        cache[key] = self.other_holidays
+
+    def load_other_holidays(self, other_holidays, fname, year):
+        """ Returns SpecialDates of --other-holidays string and
+        --other-holidays-file file """
+        res = self.parse_other_holidays(other_holidays, year)
+        if fname:
+            try:
+                f = open(fname, 'rb')
+                try:
+                    if f.read(len(SpecialDates.MAGIC)) == SpecialDates.MAGIC:
+                        f.seek(0)
+                        res.update(SpecialDates.load(f))
+                    else:
+                        f.seek(0)
+                        res.update(self.parse_other_holidays(f.read(), year))
+                finally:
+                    f.close()
+            except (IOError, ValueError) as e:
+                inkex.errormsg("Error in reading other holidays file.\n%s" % e)
+                exit(1)
+        return res
+
+    def parse_other_holidays(self, other_holidays, year):
+        """ Returns SpecialDates parsed from --other-holidays string """
         def replace_year(dt):
-            return date( int(self.options.year), dt.month, dt.day  )
-        self.other_holidays = []
+            return date( year, dt.month, dt.day  )
+        res = []
+        fallbacks = 0
         try:
-            for d in re.split("[;,]+", self.options.other_holidays):
+            for d in OTHER_HOLIDAYS_SEP.split(other_holidays):
                 d = d.strip()
-                parts = re.split("[ \t]+", d)
+                parts = DESCRIPTION_SEP.split(d)
                 if parts and (parts[0]):
-                    part = {
-                        'date': replace_year(parser.parse(parts[0]).date()),
-                        'description': ''
-                    }
-                    if len(parts)>1:
-                        part['description'] = " ".join(parts[1:])
-                    self.other_holidays.append(part)
+                    dt = parse_fast_date(parts[0], year)
+                    if dt is None:
+                        fallbacks += 1
+                        dt = replace_year(parser.parse(parts[0]).date())
+                    res.append((dt, " ".join(parts[1:])))
         except Exception as e:
             inkex.errormsg("Error in parsing holidays string. Dates should be delimited by ';'. Optional date description should be appended after date followed by <space> character. \n%s" % e)
             exit(1)   
-        self.other_holidays_dates = [o['date'] for o in self.other_holidays]
+        if self.options.report_date_parsing and res:
+            inkex.errormsg("Other holidays: %d dates, %d (%.1f%%) parsed by general date parser"
+                           % (len(res), fallbacks, 100.0 * fallbacks / len(res)))
+        return SpecialDates(res)
+
+    def get_holiday_rules(self):
+        """ Returns HolidayRules of --default-holidays, --holiday-rules
+        and --holiday-rules-file options """
+        o = self.options
+        specs = []
+        if o.default_holidays:
+            specs.append(POLISH_HOLIDAYS)
+        specs.append(o.holiday_rules)
+        try:
+            if o.holiday_rules_file:
+                f = open(o.holiday_rules_file)
+                try:
+                    specs.append(f.read())
+                finally:
+                    f.close()
+            return compile_rules('\n'.join(specs))
+        except (IOError, ValueError) as e:
+            inkex.errormsg("Error in holiday rules. Rules should be delimited by '|' or new lines, each one is a date rule (MM-DD, easter+N, MM/WD#N or RRULE:...) followed by <space> character and holiday name. \n%s" % e)
+            exit(1)
 
     # initial values:
     month_x_pos = 0
@@ -208,6 +339,16 @@ class SVGCalendar (inkex.Effect):
         #month_margin month_width months_per_line auto_organize
         self.doc_w = inkex.unittouu(self.document.getroot().get('width'))
         self.doc_h = inkex.unittouu(self.document.getroot().get('height'))
+        o = self.options
+        key = (self.doc_w, self.doc_h, o.auto_organize, o.months_per_line,
+               o.month_width, o.month_margin, o.month, o.frame_enabled,
+               o.font_day, o.font_month, o.color_day, o.color_day_name,
+               o.color_nmd, o.color_weekend, o.color_month, o.color_year,
+               o.color_other_holiday, o.css_classes)
+        if key in self._layout_cache:
+            self.__dict__.update(self._layout_cache[key])
+            self.create_style_registry()
+            return
         if self.options.auto_organize:
           if self.doc_h > self.doc_w:
             self.months_per_line = 3
@@ -265,6 +406,24 @@ class SVGCalendar (inkex.Effect):
         self.style_year['font-weight'] = 'bold'
         self.style_other_holiday = self.style_day.copy()
         self.style_other_holiday['fill'] = self.options.color_other_holiday
+        self._formatted_styles = {}
+        self._layout_cache[key] = dict((a, getattr(self, a)) for a in LAYOUT_ATTRS)
+        self.create_style_registry()
+
+    def create_style_registry(self):
+        """ Creates style registry of a single calendar, CSS classes depend
+        only on that calendar. Formatted styles are shared between calendars
+        of the same layout. """
+        self.styles = StyleRegistry(self.options.css_classes,
+                                    self._formatted_styles)
+        for name, style in (('day', self.style_day),
+                            ('weekend', self.style_weekend),
+                            ('nmd', self.style_nmd),
+                            ('other-holiday', self.style_other_holiday),
+                            ('day-name', self.style_day_name),
+                            ('month', self.style_month),
+                            ('year', self.style_year)):
+            self.styles.register(name, style)
 
        
 
@@ -282,31 +441,44 @@ class SVGCalendar (inkex.Effect):
           if self.options.weekend=='sun' and pos==6: return True
         return False
 
-    def is_holiday(self, month, day):
-        try:
-            dt = date(int(self.options.year), month, day)
-            return dt in self.holidays.itervalues()
-        except:
-            return False
+    def classify_days(self):
+        """ Builds the per-year day classification table.
 
-    def is_other_holiday(self, month, day):
-        try:
-            dt = date(int(self.options.year), month, day)
-            return dt in self.other_holidays_dates
-        except:
-            return False
+        Every day of the year gets one entry in `day_flags` (DAY_* bits) and
+        one in `day_descr` (index into `day_other_holidays`, 0 - no entries),
+        so the day cells can be classified without scanning holiday lists.
+        """
+        year = int(self.options.year)
+        self.year_start = date(year, 1, 1).toordinal()
+        self.month_starts = [0]
+        for m in range(1, 13):
+            self.month_starts.append(self.month_starts[-1] +
+                                     calendar.monthrange(year, m)[1])
+        self.day_flags = array('B', [0]) * 366
+        self.day_descr = array('H', [0]) * 366
+        self.day_other_holidays = [[]]
+        for o in self.holiday_rules.ordinals(year):
+            i = o - self.year_start
+            if 0 <= i < self.month_starts[12]:
+                self.day_flags[i] |= DAY_HOLIDAY
+        for month, day, descriptions in self.other_holidays.days():
+            i = self.day_index(month, day)
+            # e.g. 02-29 from a special days file in a non-leap year
+            if i is None:
+                continue
+            self.day_flags[i] |= DAY_OTHER_HOLIDAY
+            self.day_descr[i] = len(self.day_other_holidays)
+            self.day_other_holidays.append(descriptions)
+        self.weekend_days = [self.is_weekend(pos) for pos in range(7)]
 
-    def get_other_holidays(self, month, day):
-        try:
-            res = []
-            dt = date(int(self.options.year), month, day)            
-            if dt in self.other_holidays_dates:
-                for o in self.other_holidays:
-                    if o['date'] == dt:
-                        res.append(o)
-            return res
-        except:
+    def day_index(self, month, day):
+        """ Returns day of year index (0 based) or None for invalid date """
+        if month < 1 or month > 12 or day < 1:
             return None
+        i = self.month_starts[month-1] + day - 1
+        if i >= self.month_starts[month]:
+            return None
+        return i
 
     def in_line_month(self, cal):
         cal2 = []
@@ -322,13 +494,13 @@ class SVGCalendar (inkex.Effect):
                     'fill'          : color_fill,
                 }
                     
-        attribs = {
-            'style'     : simplestyle.formatStyle(style),
+        attribs = self.styles.attribs(style, 'frame')
+        attribs.update({
             'height'    : str(h),
             'width'     : str(w),
             'x'         : str(x),
             'y'         : str(y)
-            }
+            })
         circ = inkex.etree.SubElement(parent, inkex.addNS('rect','svg'), attribs )
 
     def create_month(self, month, day_maker, **kwargs):
@@ -356,20 +528,25 @@ class SVGCalendar (inkex.Effect):
           day_maker.onNewWeek(week)
           week_x = 0
           for day in week:
+            i = self.day_index(month, day_of_month)
+            flags = self.day_flags[i] if i is not None else 0
             style = self.style_day
-            if self.is_weekend(week_x): 
+            if self.weekend_days[week_x]:
                 style = self.style_weekend
             if day == 0: style = self.style_nmd
-            if (day <> 0) and (self.is_other_holiday(month, day_of_month)):
+            if (day <> 0) and (flags & DAY_OTHER_HOLIDAY):
                 style = self.style_other_holiday
-            if (day <> 0) and (self.is_holiday(month, day_of_month)): 
+            if (day <> 0) and (flags & DAY_HOLIDAY):
                 style = self.style_weekend
+            other_holidays = None
+            if i is not None:
+                other_holidays = self.day_other_holidays[self.day_descr[i]]
             day_maker.make(self, 
                     month, 
                     week, 
                     day, 
                     style, 
-                    other_holidays=self.get_other_holidays(month, day_of_month)
+                    other_holidays=other_holidays
                 )
             week_x += 1
             if day <> 0:
@@ -378,27 +555,211 @@ class SVGCalendar (inkex.Effect):
         if self.month_x_pos >= self.months_per_line:
           self.month_x_pos = 0
           self.month_y_pos += 1
+        return g
 
 
-    def effect(self):
+    def prepare_year(self):
+        """ Validates options and computes layout and day tables of the year """
         self.validate_options()
         self.calculate_size_and_positions()
-        parent = self.document.getroot()
+        self.month_x_pos = 0
+        self.month_y_pos = 0
+        self.classify_days()
+
+    def create_year(self, parent):
+        """ Creates year group (with optional year header) in parent """
         txt_atts = {
           'id': 'year_'+str(self.options.year) }
         self.year_g = inkex.etree.SubElement(parent, 'g', txt_atts)
         if self.options.year_visible: 
-            txt_atts = {'style': simplestyle.formatStyle(self.style_year),
+            txt_atts = self.styles.attribs(self.style_year)
+            txt_atts.update({
                     'x': str( self.doc_w / 2 ),
-                    'y': str( self.day_w * 1.5 ) }
+                    'y': str( self.day_w * 1.5 ) })
             inkex.etree.SubElement(self.year_g, 'text', txt_atts).text = str(self.options.year)
-        self.holidays = get_holidays(int(self.options.year))
+
+    def generate_months(self):
+        """ Creates month groups in year group, yields each created group """
         day_maker = DayMakersFactory.make(self.options)
         if self.options.month == 0:
-            for m in range(1,13):
-                self.create_month(m, day_maker)
+            months = range(1,13)
         else:
-          self.create_month(self.options.month, day_maker)
+            months = [self.options.month]
+        for m in months:
+            yield self.create_month(m, day_maker)
+
+    def create_style_sheet(self):
+        """ Creates style element with used CSS classes in year group """
+        style = inkex.etree.SubElement(self.year_g, inkex.addNS('style','svg'),
+                                       {'type': 'text/css'})
+        style.text = self.styles.css()
+        return style
+
+    def effect(self):
+        self.prepare_year()
+        self.create_year(self.document.getroot())
+        for g in self.generate_months():
+            pass
+        if self.options.css_classes:
+            self.create_style_sheet()
+
+    def write_stream(self, stream):
+        """ Renders calendar and writes the document to stream incrementally.
+
+        The document is written up to the year group first, then every
+        month group is serialized and removed from the tree as soon as it
+        is created, so the whole calendar is never held in memory. The
+        written document is the same as the one effect() builds, the
+        document is left with an empty year group.
+
+        :stream: file like object
+        """
+        self.prepare_year()
+        self.create_year(self.document.getroot())
+        # the marker comment splits the document at the end of year group,
+        # its text must not occur anywhere else in the document
+        plain = inkex.etree.tostring(self.document)
+        n = 0
+        while ('months-%d' % n) in plain:
+            n += 1
+        marker = inkex.etree.Comment('months-%d' % n)
+        self.year_g.append(marker)
+        head, tail = inkex.etree.tostring(self.document).split(
+                inkex.etree.tostring(marker), 1)
+        self.year_g.remove(marker)
+        stream.write(head)
+        stream.flush()
+        for g in self.generate_months():
+            stream.write(self.serialize_in_year(g))
+        if self.options.css_classes:
+            stream.write(self.serialize_in_year(self.create_style_sheet()))
+        stream.write(tail)
+
+    def serialize_in_year(self, element):
+        """ Removes element from year group and returns it serialized as
+        a part of the document, without repeating namespace declarations """
+        # declarations are made by the wrapper element, and stripped with it
+        wrapper = inkex.etree.Element(self.year_g.tag,
+                                      nsmap=self.year_g.nsmap)
+        wrapper.append(element)
+        res = inkex.etree.tostring(wrapper)
+        return res[res.index('>') + 1:res.rindex('</')]
+
+    def prepare_batch(self, args=sys.argv[1:]):
+        """ Parses options and input document once for render_job calls """
+        self.getoptions(args)
+        self.parse()
+        self._batch_options = self.options
+        self._batch_document = self.document
+
+    def render_job(self, n, year, overrides, output, streaming=False):
+        """ Renders single batch job into its own SVG file.
+
+        :n: job index
+        :year: year to be generated
+        :overrides: dict of option destinations (i.e. {'other_holidays': '...'})
+                    or None
+        :output: output file name pattern, formatted with `job` (job index)
+                 and `year` keys, i.e. 'calendar_%(job)04d_%(year)d.svg'
+        :streaming: write file with write_stream instead of building
+                    the whole document first
+
+        Returns written file name.
+        """
+        self.options = copy.copy(self._batch_options)
+        self.options.year = year
+        for dest, value in (overrides or {}).items():
+            setattr(self.options, dest, value)
+        self.document = copy.deepcopy(self._batch_document)
+        fname = output % {'job': n,
+                          'year': int(year) or datetime.today().year}
+        if streaming:
+            f = open(fname, 'wb')
+            try:
+                self.write_stream(f)
+            finally:
+                f.close()
+        else:
+            self.effect()
+            self.document.write(fname)
+        return fname
+
+    def render_batch(self, jobs, output, args=sys.argv[1:], streaming=False):
+        """ Renders many calendars in one process, one SVG file per job.
+
+        :jobs: iterable of (year, overrides) pairs, see render_job
+        :output: output file name pattern, see render_job
+        :args: command line arguments, the last one is the input document
+        :streaming: see render_job
+
+        Options are parsed and the input document is loaded only once.
+        Holidays, special days and layout styles are cached between jobs.
+        Returns list of written file names.
+        """
+        self.prepare_batch(args)
+        res = [self.render_job(n, year, overrides, output, streaming)
+               for n, (year, overrides) in enumerate(jobs)]
+        self.options = self._batch_options
+        self.document = self._batch_document
+        return res
+
+
+class JobError(Exception):
+    """ Batch job failed in render_parallel worker process """
+
+# calendar used by render_parallel worker process, or error preparing it
+_worker_calendar = None
+_worker_error = None
+
+def _init_worker(args):
+    global _worker_calendar, _worker_error
+    try:
+        _worker_calendar = SVGCalendar()
+        _worker_calendar.prepare_batch(args)
+    except SystemExit as e:
+        # exiting the initializer would make the pool start workers endlessly
+        _worker_error = "Error in batch options (exit status %s)" % e.code
+
+def _render_worker_job(job):
+    if _worker_error:
+        raise JobError(_worker_error)
+    try:
+        return _worker_calendar.render_job(*job)
+    except SystemExit:
+        # the error is already reported with inkex.errormsg, exiting would
+        # leave the job without result and pool.map waiting for it forever
+        raise JobError("Error in batch job %d (year %s)" % job[:2])
+
+def render_parallel(jobs, output, args=sys.argv[1:], processes=None, chunksize=1,
+                    streaming=False):
+    """ Renders batch jobs in a pool of worker processes.
+
+    :jobs: iterable of (year, overrides) pairs, see SVGCalendar.render_job
+    :output: output file name pattern, see SVGCalendar.render_job
+    :args: command line arguments, the last one is the input document
+    :processes: number of worker processes, cpu count if None
+    :chunksize: number of jobs sent to a worker at once
+    :streaming: see SVGCalendar.render_job
+
+    Every worker parses options and input document once and keeps its
+    caches between jobs. Each job is written to its own file, so output is
+    the same as from SVGCalendar.render_batch. Returns list of written
+    file names in jobs order. If a job fails, the other ones are stopped
+    and the process exits, as render_batch does.
+    """
+    tasks = [(n, year, overrides, output, streaming)
+             for n, (year, overrides) in enumerate(jobs)]
+    pool = multiprocessing.Pool(processes, _init_worker, (args,))
+    try:
+        res = pool.map(_render_worker_job, tasks, chunksize)
+    except JobError as e:
+        pool.terminate()
+        inkex.errormsg(str(e))
+        exit(1)
+    finally:
+        pool.close()
+        pool.join()
+    return res
 
 
 if __name__ == '__main__':   #pragma: no cover
@@ -0,0 +1,50 @@
+"""
+  Checks that a dateutil.parser.layoutcache survives pickling, also with
+  shapes still waiting for samples.
+"""
+import copy, os, pickle, sys, unittest
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from dateutil.parser import layoutcache, parse_many
+
+DEFAULT = datetime(2020, 2, 29)
+
+# the first shape gets its layout, the other ones are still sampled
+FIRST = ["2003-09-%02d" % day for day in range(1, 13)] + \
+        ["10:%02d 2018-05-%02d" % (day, day) for day in range(1, 4)] + \
+        ["Sep %d 2003" % day for day in range(1, 3)]
+LATER = ["2017-01-%02d" % day for day in range(1, 29)] + \
+        ["%02d:%02d 2018-%02d-20" % (day, day * 2, day % 12 + 1)
+         for day in range(1, 24)] + \
+        ["Sep %d 2003" % day for day in range(3, 20)] + \
+        ["2003-13-25", "10:61 2018-05-20"]
+
+def results(timestrs, layouts):
+    return [(res, repr(err)) for res, err in
+            parse_many(timestrs, layouts=layouts, default=DEFAULT,
+                       ignoretz=True)]
+
+class LayoutCachePickleTest(unittest.TestCase):
+
+    def test_pickle_partly_filled(self):
+        cache = layoutcache()
+        results(FIRST, cache)
+        self.assertTrue(cache.layouts)
+        self.assertTrue(cache._samples)
+
+        expected_cache = copy.deepcopy(cache)
+        expected = results(LATER, expected_cache)
+
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            loaded = pickle.loads(pickle.dumps(cache, protocol))
+            self.assertEqual(sorted(loaded._samples),
+                             sorted(cache._samples))
+            self.assertEqual(results(LATER, loaded), expected, protocol)
+            self.assertEqual(repr(loaded.layouts),
+                             repr(expected_cache.layouts), protocol)
+            self.assertEqual(repr(loaded), repr(expected_cache), protocol)
+
+if __name__ == '__main__':
+    unittest.main()
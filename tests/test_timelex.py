@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+  Differential test of the dateutil.parser lexers: _timelex.split tokenizes
+  whole strings with regular expressions and has to return the same tokens
+  as the character by character _timelex.get_token.
+"""
+import os, random, sys, unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from dateutil.parser import _timelex
+
+CORPUS = (
+    u"",
+    u" ",
+    u"2003-09-25",
+    u"2003-09-25T10:49:41",
+    u"2003-09-25T10:49:41,502",
+    u"2003-09-25T10:49:41.5-03:00",
+    u"2003-09-25T10:49:41.502Z",
+    u"20030925T104941",
+    u"19990101T235959.5",
+    u"19990101T2359",
+    u"Thu Sep 25 10:36:28 BRST 2003",
+    u"Thu, 25 Sep 2003 10:49:41 -0300",
+    u"Sep.20.2009",
+    u"Sep 2003",
+    u"4:30:21.447",
+    u"10:36",
+    u"12h32m",
+    u"10,5",
+    u"1,5",
+    u"1.a",
+    u"1.a ",
+    u"a.b.c 1.2.3",
+    u"25.12.2018",
+    u"1996.07.10 AD at 15:08:56 PDT",
+    u"Wed, July 10, '96",
+    u"5:50 A.M. on June 13, 1990",
+    u"3rd of May 2001",
+    u"0:01:02 on July 4, 1976",
+    u"Today is January 1, 2047 at 8:21:00AM",
+    u"10 h 36.5 m",
+    u"żółw 12",
+    u"٣ 12.٣",
+    u"a\x00b\t1",
+    )
+
+# characters and pieces the random strings are made of
+CHARS = u"aZx09 5.,:-+/\t\x00Tż²٣  _'()"
+PIECES = (u"2003", u"09", u"25", u"1", u"10", u"49", u"41", u"502", u"0",
+          u"Sep", u"sep", u"January", u"Thu", u"T", u"Z", u"AM", u"p.m.",
+          u"BRST", u"of", u"żółw", u"٣", u" ", u"  ", u".", u",", u":",
+          u"-", u"+", u"/", u"'", u"\t")
+
+class TimelexSplitTest(unittest.TestCase):
+
+    def assertSameTokens(self, s):
+        self.assertEqual(_timelex.split(s), list(_timelex(s)), repr(s))
+
+    def test_corpus(self):
+        for s in CORPUS:
+            self.assertSameTokens(s)
+
+    def test_bytes(self):
+        # bytes are decoded with the default encoding, ASCII on python2
+        for s in CORPUS:
+            try:
+                s = s.encode('ascii')
+            except UnicodeEncodeError:
+                continue
+            self.assertEqual(_timelex.split(s), list(_timelex(s)), repr(s))
+
+    def test_random_chars(self):
+        rnd = random.Random(0)
+        for length in (3, 6, 10, 16):
+            for i in range(5000):
+                self.assertSameTokens(u''.join(
+                    rnd.choice(CHARS) for _ in range(rnd.randint(0, length))))
+
+    def test_random_pieces(self):
+        rnd = random.Random(1)
+        for i in range(20000):
+            self.assertSameTokens(u''.join(
+                rnd.choice(PIECES) for _ in range(rnd.randint(1, 12))))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+"""
+  Checks that SVGCalendar.write_stream writes the same document as effect()
+
+  Needs Python 2 with Inkscape's inkex module (and lxml) on the path.
+"""
+import os, sys, tempfile, unittest
+from io import BytesIO
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+svgcalendarpl = None
+# the extension is Python 2 code
+if sys.version_info[0] == 2:
+    try:
+        import svgcalendarpl
+    except ImportError:
+        pass
+
+TEMPLATE = """<?xml version="1.0" encoding="UTF-8" standalone="no"?>
+<!-- Created with Inkscape -->
+<svg xmlns:dc="http://purl.org/dc/elements/1.1/"
+   xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+   xmlns="http://www.w3.org/2000/svg"
+   xmlns:sodipodi="http://sodipodi.sourceforge.net/DTD/sodipodi-0.dtd"
+   xmlns:inkscape="http://www.inkscape.org/namespaces/inkscape"
+   width="1052" height="744" id="svg2">
+  <!-- months -->
+  <!--months-0-->
+  <sodipodi:namedview id="base" inkscape:zoom="0.35"/>
+  <metadata><rdf:RDF><dc:title>Kalendarz</dc:title></rdf:RDF></metadata>
+  <g inkscape:label="Layer 1" id="layer1"><text>months</text></g>
+</svg>
+"""
+
+OPTIONS = (
+    ['--year=2018'],
+    ['--year=2018', '--css-classes=True'],
+    ['--year=2016', '--frame-enabled=True', '--fill-empty-day-boxes=False',
+     '--other-holidays=05-03 x;2016-06-01 y'],
+    ['--year=2019', '--month=4', '--year-visible=False'],
+    ['--year=2018', '--month=1', '--year-visible=False', '--css-classes=True'],
+    )
+
+@unittest.skipIf(svgcalendarpl is None, "needs Python 2 and inkex")
+class WriteStreamTest(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.template = tempfile.mkstemp(suffix='.svg')
+        os.write(fd, TEMPLATE.encode('utf-8'))
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.template)
+
+    def test_same_as_effect(self):
+        for args in OPTIONS:
+            args = args + [self.template]
+            expected = svgcalendarpl.SVGCalendar()
+            expected.affect(args, output=False)
+            expected_out = BytesIO()
+            expected.document.write(expected_out)
+
+            streamed = svgcalendarpl.SVGCalendar()
+            streamed.getoptions(args)
+            streamed.parse()
+            streamed_out = BytesIO()
+            streamed.write_stream(streamed_out)
+
+            self.assertEqual(expected_out.getvalue(), streamed_out.getvalue(),
+                             args)
+
+if __name__ == '__main__':
+    unittest.main()